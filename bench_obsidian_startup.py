@@ -0,0 +1,156 @@
+"""Startup benchmark for start_obsidian.py: -X importtime breakdown and time to the first MCP tool response."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+LAUNCHER = ROOT / "start_obsidian.py"
+
+
+def import_report(env: dict[str, str], top: int) -> None:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import mcp_obsidian.server"],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        # "import time: <self us> | <cumulative us> | <module>", preceded by one header line.
+        fields = line.removeprefix("import time:").split("|")
+        if not line.startswith("import time:") or len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        rows.append((int(fields[1]), int(fields[0]), fields[2].strip()))
+    if not rows:
+        print(f"[ERROR] importtime produced no data: {proc.stderr.strip()[-200:]}")
+        return
+    total = max(rows)[0]
+    print(f"import mcp_obsidian.server: {total / 1000:.1f} ms cumulative")
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    for cumulative, self_time, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative / 1000:>14.1f} {self_time / 1000:>8.1f}  {name}")
+
+
+def send(proc: subprocess.Popen, message: dict) -> None:
+    proc.stdin.write((json.dumps(message) + "\n").encode("utf-8"))
+    proc.stdin.flush()
+
+
+def receive(proc: subprocess.Popen, request_id: int) -> dict:
+    while True:
+        line = proc.stdout.readline()
+        if not line:
+            raise RuntimeError("launcher exited before answering")
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            return message
+
+
+def first_tool_response(env: dict[str, str]) -> float:
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, str(LAUNCHER)],
+        env=env,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        send(
+            proc,
+            {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "initialize",
+                "params": {
+                    "protocolVersion": "2024-11-05",
+                    "capabilities": {},
+                    "clientInfo": {"name": "startup-bench", "version": "1.0"},
+                },
+            },
+        )
+        receive(proc, 1)
+        send(proc, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+        send(
+            proc,
+            {
+                "jsonrpc": "2.0",
+                "id": 2,
+                "method": "tools/call",
+                "params": {"name": "obsidian_list_files_in_vault", "arguments": {}},
+            },
+        )
+        response = receive(proc, 2)
+        elapsed = time.perf_counter() - started
+        if "error" in response or response.get("result", {}).get("isError"):
+            raise RuntimeError(f"tool call failed: {json.dumps(response, ensure_ascii=False)[:200]}")
+    finally:
+        proc.stdin.close()
+        proc.wait(timeout=10)
+    return elapsed
+
+
+def measure(name: str, env: dict[str, str], runs: int) -> float:
+    samples = [first_tool_response(env) for _ in range(runs)]
+    median = statistics.median(samples)
+    print(f"{name:<6} median {median * 1000:7.1f} ms  min {min(samples) * 1000:7.1f} ms  ({runs} runs)")
+    return median
+
+
+def start_warm_server(env: dict[str, str], socket_path: str) -> subprocess.Popen:
+    proc = subprocess.Popen([sys.executable, str(LAUNCHER), "--warm-server"], env=env, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 15
+    while not os.path.exists(socket_path):
+        if proc.poll() is not None or time.monotonic() > deadline:
+            proc.kill()
+            raise RuntimeError("warm server did not start")
+        time.sleep(0.02)
+    return proc
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure start_obsidian.py cold and warm startup.")
+    parser.add_argument("--runs", type=int, default=5, help="sessions per mode")
+    parser.add_argument("--top", type=int, default=12, help="modules shown in the import report")
+    parser.add_argument("--skip-warm", action="store_true", help="only measure the cold start")
+    args = parser.parse_args()
+
+    # The local backend answers list_files_in_vault without the Obsidian app, so no REST server is needed.
+    env = dict(os.environ)
+    env.setdefault("OBSIDIAN_API_KEY", "startup-bench")
+    env["OBSIDIAN_BACKEND"] = "local"
+    env.pop("OBSIDIAN_WARM", None)
+
+    import_report(env, args.top)
+    print()
+    try:
+        cold = measure("cold", env, args.runs)
+        if args.skip_warm or os.name != "posix":
+            return 0
+        with tempfile.TemporaryDirectory(prefix="obsidian-warm-") as tmp:
+            socket_path = os.path.join(tmp, "warm.sock")
+            warm_env = dict(env, OBSIDIAN_WARM="1", OBSIDIAN_WARM_SOCKET=socket_path)
+            server = start_warm_server(warm_env, socket_path)
+            try:
+                warm = measure("warm", warm_env, args.runs)
+            finally:
+                server.terminate()
+                server.wait(timeout=10)
+    except RuntimeError as exc:
+        print(f"[ERROR] {exc}")
+        return 1
+    print(f"warm attach saves {(cold - warm) * 1000:.1f} ms ({warm / cold * 100:.0f}% of cold)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,14 +4,43 @@
 from __future__ import annotations
 
 import argparse
+import bisect
+import ctypes
+import ctypes.util
+import hashlib
 import json
+import os
 import re
+import select
+import struct
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
 
-TODO_RE = re.compile(r"^- \[ \]\s*(.+)$", re.MULTILINE)
-DONE_RE = re.compile(r"^- \[[xX]\]\s*(.+)$", re.MULTILINE)
+from note_writer import SKIPPED, NoteWriter, report
+from stage_profiler import NULL_PROFILER, StageProfiler, add_profile_arguments, profiler_from_args
+
+TASK_RE = re.compile(r"^- \[([ xX])\]\s*(.*)$")
+TIME_BLOCK_RE = re.compile(r"^(\d{1,2}:\d{2})\s*-\s*(\d{1,2}:\d{2})$")
+SUBJECT_PREFIX_RE = re.compile(r"^[^\w\s]+\s*")
+TEMPLATE_TOKEN_RE = re.compile(r"\{\{\s*(\w+)(?::([^}]*))?\s*\}\}")
+DATE_FORMAT_RE = re.compile(r"\[([^\]]*)\]|YYYY|YY|MM|M|DD|D|dddd|ddd")
+TEMPLATE_FIELDS = {"title", "weekday", "phase", "yesterday_rate", "carry_tasks", "blocks", "prev", "next"}
+PLAN_NAME_RE = re.compile(r"^(\d{4}-\d{2}-\d{2}).*\.md$")
+
+CACHE_DIR_NAME = ".plan_cache"
+PLAN_INDEX_NAME = "plan_index.json"
+PLAN_INDEX_VERSION = 1
+PLAN_STATS_NAME = "plan_stats.json"
+PLAN_STATS_VERSION = 1
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+INOTIFY_EVENT_SIZE = struct.calcsize("iIII")
 
 SUBJECT_LABEL = {
     "math": "数学",
@@ -29,6 +58,9 @@ SUBJECT_EMOJI = {
     "review": "📊",
 }
 
+# Compiled user templates keyed by path, revalidated by mtime.
+_TEMPLATE_CACHE: dict[Path, tuple[int, list[tuple[bool, str]]]] = {}
+
 TIME_BLOCKS = [
     ("08:00", "10:00"),
     ("10:20", "12:00"),
@@ -47,15 +79,47 @@ def parse_date(value: str) -> date:
     return datetime.strptime(value, "%Y-%m-%d").date()
 
 
-def choose_phase(today: date, phases: list[dict[str, Any]]) -> dict[str, Any]:
+@dataclass(frozen=True)
+class PhaseIndex:
+    starts: list[date]
+    ends: list[date]
+    phases: list[dict[str, Any]]
+    fallback: dict[str, Any]
+
+
+def compile_phases(phases: list[dict[str, Any]]) -> PhaseIndex:
     if not phases:
         raise ValueError("config missing phases")
+    intervals = []
     for phase in phases:
         start = parse_date(phase["start"])
         end = parse_date(phase["end"])
-        if start <= today <= end:
-            return phase
-    return phases[-1]
+        if end < start:
+            raise ValueError(f"phase {phase.get('id')} ends before it starts: {phase['start']} ~ {phase['end']}")
+        intervals.append((start, end, phase))
+    intervals.sort(key=lambda item: item[0])
+
+    for (_, prev_end, prev), (start, _, phase) in zip(intervals, intervals[1:]):
+        if start <= prev_end:
+            raise ValueError(f"phase {prev.get('id')} overlaps phase {phase.get('id')} from {start.isoformat()}")
+        if start - prev_end > timedelta(days=1):
+            gap_start = prev_end + timedelta(days=1)
+            gap_end = start - timedelta(days=1)
+            print(f"[WARN] no phase covers {gap_start.isoformat()} ~ {gap_end.isoformat()}, last phase is used")
+
+    return PhaseIndex(
+        starts=[start for start, _, _ in intervals],
+        ends=[end for _, end, _ in intervals],
+        phases=[phase for _, _, phase in intervals],
+        fallback=phases[-1],
+    )
+
+
+def choose_phase(today: date, phase_index: PhaseIndex) -> dict[str, Any]:
+    idx = bisect.bisect_right(phase_index.starts, today) - 1
+    if idx >= 0 and today <= phase_index.ends[idx]:
+        return phase_index.phases[idx]
+    return phase_index.fallback
 
 
 def get_weekday_name(today: date, weekday_names: list[str] | None) -> str:
@@ -63,22 +127,223 @@ def get_weekday_name(today: date, weekday_names: list[str] | None) -> str:
     return names[today.weekday()]
 
 
-def find_yesterday_file(plan_dir: Path, today: date) -> Path | None:
-    yesterday = today - timedelta(days=1)
-    candidates = sorted(plan_dir.glob(f"{yesterday.isoformat()} *.md"))
-    return candidates[0] if candidates else None
+def scan_plan_dir(plan_dir: Path) -> dict[str, list[list[Any]]]:
+    files: dict[str, list[list[Any]]] = {}
+    with os.scandir(plan_dir) as entries:
+        for entry in entries:
+            match = PLAN_NAME_RE.match(entry.name)
+            if match is None or not entry.is_file():
+                continue
+            stat = entry.stat()
+            files.setdefault(match.group(1), []).append([entry.name, stat.st_mtime_ns, stat.st_size])
+    for names in files.values():
+        names.sort()
+    return files
+
+
+def refresh_plan_index(index: dict[str, Any], plan_dir: Path) -> None:
+    index["dir_mtime_ns"] = plan_dir.stat().st_mtime_ns
+    index["files"] = scan_plan_dir(plan_dir)
+    index["dirty"] = True
+
+
+def load_plan_index(plan_dir: Path) -> dict[str, Any]:
+    # The cache lives in a subdirectory so rewriting it never touches plan_dir's own mtime.
+    (plan_dir / CACHE_DIR_NAME).mkdir(parents=True, exist_ok=True)
+    index_path = plan_dir / CACHE_DIR_NAME / PLAN_INDEX_NAME
+    try:
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        index = {}
+    if index.get("version") != PLAN_INDEX_VERSION or index.get("dir_mtime_ns") != plan_dir.stat().st_mtime_ns:
+        index = {"version": PLAN_INDEX_VERSION}
+        refresh_plan_index(index, plan_dir)
+    return index
+
+
+def write_cache_file(path: Path, data: dict[str, Any]) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def save_plan_index(index: dict[str, Any], plan_dir: Path) -> None:
+    if index.pop("dirty", False):
+        write_cache_file(plan_dir / CACHE_DIR_NAME / PLAN_INDEX_NAME, index)
+
+
+def lookup_plan_file(index: dict[str, Any], plan_dir: Path, day: date) -> Path | None:
+    key = day.isoformat()
+    for attempt in range(2):
+        entries = index["files"].get(key, [])
+        stale = False
+        for entry in entries:
+            path = plan_dir / entry[0]
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                stale = True
+                continue
+            if [stat.st_mtime_ns, stat.st_size] != entry[1:]:
+                entry[1:] = [stat.st_mtime_ns, stat.st_size]
+                index["dirty"] = True
+            return path
+        if not stale and index["dir_mtime_ns"] == plan_dir.stat().st_mtime_ns:
+            return None
+        if attempt == 0:
+            refresh_plan_index(index, plan_dir)
+    return None
+
+
+def record_plan_file(index: dict[str, Any], plan_dir: Path, path: Path, dir_mtime_before: int) -> None:
+    stat = path.stat()
+    entries = index["files"].setdefault(path.name[:10], [])
+    entries[:] = [entry for entry in entries if entry[0] != path.name]
+    entries.append([path.name, stat.st_mtime_ns, stat.st_size])
+    entries.sort()
+    # Only advance the directory stamp when nothing else changed it since the index was validated.
+    if index["dir_mtime_ns"] == dir_mtime_before:
+        index["dir_mtime_ns"] = plan_dir.stat().st_mtime_ns
+    index["dirty"] = True
+
+
+def find_yesterday_file(index: dict[str, Any], plan_dir: Path, today: date) -> Path | None:
+    return lookup_plan_file(index, plan_dir, today - timedelta(days=1))
+
+
+@dataclass(frozen=True)
+class TaskRecord:
+    line_no: int
+    checked: bool
+    text: str
+    time_block: str
+    subject: str
+    description: str
+
+
+def parse_task_line(line: str, line_no: int) -> TaskRecord | None:
+    match = TASK_RE.match(line.rstrip("\r\n"))
+    if match is None:
+        return None
+    text = match.group(2).strip()
+    time_block = subject = ""
+    description = text
+    # Both `08:00 - 10:00 | 🧮 数学 | task` (generator) and `08:00-10:00 | 数学 | task` (template).
+    parts = [part.strip() for part in text.split("|")]
+    if len(parts) >= 3:
+        block = TIME_BLOCK_RE.match(parts[0])
+        if block is not None:
+            time_block = f"{block.group(1)}-{block.group(2)}"
+            subject = SUBJECT_PREFIX_RE.sub("", parts[1])
+            description = " | ".join(parts[2:])
+    return TaskRecord(line_no, match.group(1) != " ", text, time_block, subject, description)
+
+
+def iter_plan_tasks(lines: Iterable[str]) -> Iterator[TaskRecord]:
+    for line_no, line in enumerate(lines, start=1):
+        task = parse_task_line(line, line_no)
+        if task is not None:
+            yield task
+
+
+def compute_plan_stats(tasks: Iterable[TaskRecord]) -> dict[str, Any]:
+    pending: list[str] = []
+    done = 0
+    subjects: dict[str, list[int]] = {}
+    for task in tasks:
+        if task.checked:
+            done += 1
+        elif task.text:
+            pending.append(task.text)
+        else:
+            continue
+        if task.subject:
+            counts = subjects.setdefault(task.subject, [0, 0])
+            counts[0] += task.checked
+            counts[1] += 1
+    return {"todo": len(pending), "done": done, "subjects": subjects, "pending": pending}
 
 
-def parse_yesterday_stats(path: Path | None, carry_limit: int) -> tuple[list[str], float]:
-    if path is None or not path.exists():
-        return ([], 0.0)
+def completion_rate(stats: dict[str, Any]) -> float:
+    total = stats["todo"] + stats["done"]
+    return (stats["done"] / total) if total else 0.0
 
-    text = path.read_text(encoding="utf-8")
-    todo = [line.strip() for line in TODO_RE.findall(text) if line.strip()]
-    done = DONE_RE.findall(text)
-    total = len(todo) + len(done)
-    completion_rate = (len(done) / total) if total else 0.0
-    return (todo[:carry_limit], completion_rate)
+
+def carry_over(stats: dict[str, Any] | None, carry_limit: int) -> tuple[list[str], float]:
+    if stats is None:
+        return ([], 0.0)
+    return (stats["pending"][:carry_limit], completion_rate(stats))
+
+
+def load_stats_cache(plan_dir: Path) -> dict[str, Any]:
+    (plan_dir / CACHE_DIR_NAME).mkdir(parents=True, exist_ok=True)
+    try:
+        cache = json.loads((plan_dir / CACHE_DIR_NAME / PLAN_STATS_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        cache = {}
+    if cache.get("version") != PLAN_STATS_VERSION:
+        cache = {"version": PLAN_STATS_VERSION, "files": {}}
+    return cache
+
+
+def save_stats_cache(cache: dict[str, Any], plan_dir: Path) -> None:
+    if cache.pop("dirty", False):
+        write_cache_file(plan_dir / CACHE_DIR_NAME / PLAN_STATS_NAME, cache)
+
+
+def store_plan_stats(
+    cache: dict[str, Any],
+    path: Path,
+    data: bytes,
+    stat: os.stat_result | None,
+) -> dict[str, Any]:
+    digest = hashlib.sha1(data).hexdigest()
+    entry = cache["files"].get(path.name)
+    if entry is None or entry["sha1"] != digest:
+        tasks = iter_plan_tasks(data.decode("utf-8", errors="replace").splitlines())
+        generated = entry.get("generated") if entry is not None else None
+        entry = {"sha1": digest, "generated": generated, **compute_plan_stats(tasks)}
+        cache["files"][path.name] = entry
+    # Stats of a plan that is rendered but not yet flushed to disk are stamped once it is written.
+    entry["mtime_ns"] = stat.st_mtime_ns if stat is not None else None
+    entry["size"] = stat.st_size if stat is not None else None
+    cache["dirty"] = True
+    return entry
+
+
+def record_written_plans(
+    results: list[tuple[Path, str]],
+    plan_index: dict[str, Any],
+    stats_cache: dict[str, Any],
+    plan_dir: Path,
+    dir_mtime_before: int,
+) -> None:
+    for path, status in results:
+        if status == SKIPPED:
+            continue
+        record_plan_file(plan_index, plan_dir, path, dir_mtime_before)
+        entry = stats_cache["files"].get(path.name)
+        if entry is not None:
+            stat = path.stat()
+            entry["mtime_ns"] = stat.st_mtime_ns
+            entry["size"] = stat.st_size
+            # Remembered so the watcher can tell generated plans from hand-edited ones.
+            entry["generated"] = entry["sha1"]
+    report(results)
+
+
+def plan_file_stats(cache: dict[str, Any], path: Path | None) -> dict[str, Any] | None:
+    if path is None:
+        return None
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    entry = cache["files"].get(path.name)
+    if entry is not None and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+        return entry
+    # Touched but identical files keep their parsed stats; only changed content is re-parsed.
+    return store_plan_stats(cache, path, path.read_bytes(), stat)
 
 
 def build_subject_sequence(allocation: dict[str, float]) -> list[str]:
@@ -110,6 +375,26 @@ def build_plan_blocks(
     return blocks
 
 
+def neighbour_labels(today: date) -> tuple[str, str]:
+    prev_day = today - timedelta(days=1)
+    next_day = today + timedelta(days=1)
+    return (
+        f"{prev_day.isoformat()} {get_weekday_name(prev_day, None)}",
+        f"{next_day.isoformat()} {get_weekday_name(next_day, None)}",
+    )
+
+
+def format_carry_lines(carry_tasks: list[str]) -> str:
+    return "\n".join(f"- [ ] {task}" for task in carry_tasks) if carry_tasks else "- [ ] 无昨日未完成任务"
+
+
+def format_block_lines(blocks: list[tuple[str, str, str, str, str]]) -> str:
+    return "\n".join(
+        f"- [ ] {start} - {end} | {emoji} {label} | {task}"
+        for start, end, emoji, label, task in blocks
+    )
+
+
 def render_markdown(
     today: date,
     weekday_name: str,
@@ -118,16 +403,9 @@ def render_markdown(
     yesterday_rate: float,
     blocks: list[tuple[str, str, str, str, str]],
 ) -> str:
-    prev_day = today - timedelta(days=1)
-    next_day = today + timedelta(days=1)
-    prev_label = f"{prev_day.isoformat()} {get_weekday_name(prev_day, None)}"
-    next_label = f"{next_day.isoformat()} {get_weekday_name(next_day, None)}"
-
-    carry_lines = "\n".join(f"- [ ] {task}" for task in carry_tasks) if carry_tasks else "- [ ] 无昨日未完成任务"
-    block_lines = "\n".join(
-        f"- [ ] {start} - {end} | {emoji} {label} | {task}"
-        for start, end, emoji, label, task in blocks
-    )
+    prev_label, next_label = neighbour_labels(today)
+    carry_lines = format_carry_lines(carry_tasks)
+    block_lines = format_block_lines(blocks)
 
     return (
         f"---\n"
@@ -160,41 +438,472 @@ def render_markdown(
     )
 
 
+def compile_date_format(fmt: str) -> list[tuple[bool, str]]:
+    segments: list[tuple[bool, str]] = []
+    pos = 0
+    for match in DATE_FORMAT_RE.finditer(fmt):
+        segments.append((False, fmt[pos:match.start()]))
+        if match.group(1) is not None:
+            segments.append((False, match.group(1)))
+        else:
+            segments.append((True, match.group(0)))
+        pos = match.end()
+    segments.append((False, fmt[pos:]))
+    return segments
+
+
+def compile_template(text: str) -> list[tuple[bool, str]]:
+    segments: list[tuple[bool, str]] = []
+    pos = 0
+    for match in TEMPLATE_TOKEN_RE.finditer(text):
+        name, fmt = match.groups()
+        if name == "date":
+            parts = compile_date_format(fmt or "YYYY-MM-DD")
+        elif name in TEMPLATE_FIELDS and fmt is None:
+            parts = [(True, name)]
+        else:
+            # Unknown placeholders such as Obsidian's {{time}} are kept verbatim.
+            continue
+        segments.append((False, text[pos:match.start()]))
+        segments.extend(parts)
+        pos = match.end()
+    segments.append((False, text[pos:]))
+
+    merged: list[tuple[bool, str]] = []
+    for is_field, value in segments:
+        if not is_field and merged and not merged[-1][0]:
+            merged[-1] = (False, merged[-1][1] + value)
+        elif is_field or value:
+            merged.append((is_field, value))
+    return merged
+
+
+def load_template(path: Path) -> list[tuple[bool, str]]:
+    mtime_ns = path.stat().st_mtime_ns
+    cached = _TEMPLATE_CACHE.get(path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    segments = compile_template(path.read_text(encoding="utf-8"))
+    _TEMPLATE_CACHE[path] = (mtime_ns, segments)
+    return segments
+
+
+def render_template(
+    segments: list[tuple[bool, str]],
+    today: date,
+    weekday_name: str,
+    phase: dict[str, Any],
+    carry_tasks: list[str],
+    yesterday_rate: float,
+    blocks: list[tuple[str, str, str, str, str]],
+    title: str,
+) -> str:
+    prev_label, next_label = neighbour_labels(today)
+    fields = {
+        "YYYY": f"{today.year:04d}",
+        "YY": f"{today.year % 100:02d}",
+        "MM": f"{today.month:02d}",
+        "M": str(today.month),
+        "DD": f"{today.day:02d}",
+        "D": str(today.day),
+        "dddd": weekday_name,
+        "ddd": weekday_name,
+        "title": title,
+        "weekday": weekday_name,
+        "phase": f"Phase {phase['id']} - {phase['name']}",
+        "yesterday_rate": f"{yesterday_rate:.1%}",
+        "carry_tasks": format_carry_lines(carry_tasks),
+        "blocks": format_block_lines(blocks),
+        "prev": prev_label,
+        "next": next_label,
+    }
+    return "".join(fields[value] if is_field else value for is_field, value in segments)
+
+
+def read_if_changed(cache: dict[str, Any], path: Path) -> tuple[Path, os.stat_result, bytes | None] | None:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    entry = cache["files"].get(path.name)
+    if entry is not None and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+        return (path, stat, None)
+    return (path, stat, path.read_bytes())
+
+
+def collect_daily_stats(output_dir: Path, workers: int) -> dict[date, dict[str, Any]]:
+    if not output_dir.is_dir():
+        return {}
+    plan_index = load_plan_index(output_dir)
+    stats_cache = load_stats_cache(output_dir)
+    paths = [
+        (day, output_dir / entry[0])
+        for day, entries in plan_index["files"].items()
+        for entry in entries
+    ]
+
+    daily: dict[date, dict[str, Any]] = {}
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        results = pool.map(lambda item: read_if_changed(stats_cache, item[1]), paths)
+        for (day, _), result in zip(paths, results):
+            if result is None:
+                continue
+            path, stat, data = result
+            if data is None:
+                stats = stats_cache["files"][path.name]
+            else:
+                stats = store_plan_stats(stats_cache, path, data, stat)
+            totals = daily.setdefault(parse_date(day), {"done": 0, "total": 0, "subjects": {}})
+            totals["done"] += stats["done"]
+            totals["total"] += stats["done"] + stats["todo"]
+            for subject, (done, total) in stats["subjects"].items():
+                counts = totals["subjects"].setdefault(subject, [0, 0])
+                counts[0] += done
+                counts[1] += total
+
+    save_stats_cache(stats_cache, output_dir)
+    save_plan_index(plan_index, output_dir)
+    return daily
+
+
+def summarize_history(daily: dict[date, dict[str, Any]], today: date, threshold: float) -> dict[str, Any]:
+    days = sorted(day for day in daily if day <= today)
+
+    def window_rate(length: int) -> dict[str, Any]:
+        first = today - timedelta(days=length - 1)
+        done = sum(daily[day]["done"] for day in days if day >= first)
+        total = sum(daily[day]["total"] for day in days if day >= first)
+        return {"done": done, "total": total, "rate": (done / total) if total else 0.0}
+
+    def meets(day: date) -> bool:
+        totals = daily.get(day)
+        return bool(totals and totals["total"] and totals["done"] / totals["total"] >= threshold)
+
+    longest = run = 0
+    previous_day: date | None = None
+    for day in days:
+        if not meets(day):
+            run = 0
+        elif previous_day == day - timedelta(days=1):
+            run += 1
+        else:
+            run = 1
+        longest = max(longest, run)
+        previous_day = day
+
+    # Today's plan is usually still in progress, so it only extends the streak once it qualifies.
+    cursor = today if meets(today) else today - timedelta(days=1)
+    current = 0
+    while meets(cursor):
+        current += 1
+        cursor -= timedelta(days=1)
+
+    subjects: dict[str, list[int]] = {}
+    for day in days:
+        for subject, (done, total) in daily[day]["subjects"].items():
+            counts = subjects.setdefault(subject, [0, 0])
+            counts[0] += done
+            counts[1] += total
+
+    return {
+        "date": today.isoformat(),
+        "days_tracked": len(days),
+        "rolling_7": window_rate(7),
+        "rolling_30": window_rate(30),
+        "all_time": window_rate((today - days[0]).days + 1) if days else window_rate(1),
+        "streak_threshold": threshold,
+        "current_streak": current,
+        "longest_streak": longest,
+        "subjects": {
+            subject: {"done": done, "total": total, "rate": (done / total) if total else 0.0}
+            for subject, (done, total) in sorted(subjects.items(), key=lambda item: item[1][1], reverse=True)
+        },
+    }
+
+
+def format_history(summary: dict[str, Any]) -> str:
+    def rate_line(label: str, window: dict[str, Any]) -> str:
+        return f"- {label}：{window['rate']:.1%}（{window['done']}/{window['total']}）"
+
+    lines = [
+        f"[STATS] {summary['date']} · 共 {summary['days_tracked']} 天计划",
+        rate_line("近7天完成率", summary["rolling_7"]),
+        rate_line("近30天完成率", summary["rolling_30"]),
+        rate_line("累计完成率", summary["all_time"]),
+        f"- 当前连续达标：{summary['current_streak']} 天（阈值 {summary['streak_threshold']:.0%}）",
+        f"- 最长连续达标：{summary['longest_streak']} 天",
+        "- 科目完成率：",
+    ]
+    for subject, counts in summary["subjects"].items():
+        lines.append(f"  - {subject}：{counts['rate']:.1%}（{counts['done']}/{counts['total']}）")
+    return "\n".join(lines)
+
+
+def resolve_date_range(args: argparse.Namespace) -> tuple[date, date]:
+    start = parse_date(args.start or args.date)
+    if args.end:
+        end = parse_date(args.end)
+    else:
+        end = start + timedelta(days=max(args.days, 1) - 1)
+    if end < start:
+        raise ValueError(f"end date {end.isoformat()} is before start date {start.isoformat()}")
+    return (start, end)
+
+
+@dataclass
+class PlanContext:
+    output_dir: Path
+    phase_index: PhaseIndex
+    weekday_names: list[str] | None
+    templates: dict[str, str]
+    plan_index: dict[str, Any]
+    stats_cache: dict[str, Any]
+
+
+def load_plan_context(config: dict[str, Any], output_dir: Path) -> PlanContext:
+    phase_index = compile_phases(config.get("phases", []))
+    output_dir.mkdir(parents=True, exist_ok=True)
+    return PlanContext(
+        output_dir=output_dir,
+        phase_index=phase_index,
+        weekday_names=config.get("weekday_names"),
+        templates=config.get("subject_templates", {}),
+        plan_index=load_plan_index(output_dir),
+        stats_cache=load_stats_cache(output_dir),
+    )
+
+
+def save_plan_context(ctx: PlanContext) -> None:
+    save_stats_cache(ctx.stats_cache, ctx.output_dir)
+    save_plan_index(ctx.plan_index, ctx.output_dir)
+
+
+def plan_path(ctx: PlanContext, today: date) -> Path:
+    return ctx.output_dir / f"{today.isoformat()} {get_weekday_name(today, ctx.weekday_names)}.md"
+
+
+def generate_plans(
+    ctx: PlanContext,
+    start: date,
+    end: date,
+    carry_limit: int,
+    writer: NoteWriter,
+    template_path: Path | None = None,
+    profiler: StageProfiler = NULL_PROFILER,
+) -> None:
+    output_dir = ctx.output_dir
+    # Stats of the plan rendered for the previous day, so carry-over chains in memory.
+    previous: dict[str, Any] | None = None
+    for offset in range((end - start).days + 1):
+        today = start + timedelta(days=offset)
+        day = today.isoformat()
+        weekday_name = get_weekday_name(today, ctx.weekday_names)
+        output_path = plan_path(ctx, today)
+        if output_path.exists() and not writer.force:
+            print(f"[SKIP] output exists: {output_path}")
+            writer.skip(output_path)
+            previous = None
+            continue
+
+        if previous is None:
+            with profiler.stage("yesterday_lookup", date=day):
+                yesterday_file = find_yesterday_file(ctx.plan_index, output_dir, today)
+            with profiler.stage("parse", date=day):
+                previous = plan_file_stats(ctx.stats_cache, yesterday_file)
+        carry_tasks, yesterday_rate = carry_over(previous, carry_limit)
+        with profiler.stage("phase_select", date=day):
+            phase = choose_phase(today, ctx.phase_index)
+        with profiler.stage("build_blocks", date=day):
+            blocks = build_plan_blocks(phase.get("allocation", {}), ctx.templates)
+        with profiler.stage("render", date=day):
+            if template_path is None:
+                content = render_markdown(today, weekday_name, phase, carry_tasks, yesterday_rate, blocks)
+            else:
+                content = render_template(
+                    load_template(template_path),
+                    today,
+                    weekday_name,
+                    phase,
+                    carry_tasks,
+                    yesterday_rate,
+                    blocks,
+                    output_path.stem,
+                )
+            previous = store_plan_stats(ctx.stats_cache, output_path, content.encode("utf-8"), None)
+        with profiler.stage("write", date=day):
+            dir_mtime_before = output_dir.stat().st_mtime_ns
+            results = writer.add(output_path, content)
+            record_written_plans(results, ctx.plan_index, ctx.stats_cache, output_dir, dir_mtime_before)
+
+    with profiler.stage("write", pending=len(writer.pending)):
+        dir_mtime_before = output_dir.stat().st_mtime_ns
+        record_written_plans(writer.flush(), ctx.plan_index, ctx.stats_cache, output_dir, dir_mtime_before)
+
+
+def open_inotify(directory: Path) -> int | None:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    if libc.inotify_add_watch(fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+def read_inotify_names(fd: int, timeout: float | None) -> set[str]:
+    ready, _, _ = select.select([fd], [], [], timeout)
+    if not ready:
+        return set()
+    data = os.read(fd, 64 * 1024)
+    names: set[str] = set()
+    offset = 0
+    while offset < len(data):
+        _, _, _, length = struct.unpack_from("iIII", data, offset)
+        offset += INOTIFY_EVENT_SIZE
+        name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+        offset += length
+        if name:
+            names.add(name)
+    return names
+
+
+def snapshot_plan_dir(directory: Path) -> dict[str, tuple[int, int]]:
+    snapshot: dict[str, tuple[int, int]] = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if PLAN_NAME_RE.match(entry.name) and entry.is_file():
+                stat = entry.stat()
+                snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+def watch_changes(directory: Path, poll_interval: float, debounce: float = 0.5) -> Iterator[set[str]]:
+    fd = open_inotify(directory)
+    if fd is None:
+        print(f"[WATCH] inotify unavailable, polling every {poll_interval:g}s")
+        snapshot = snapshot_plan_dir(directory)
+        while True:
+            time.sleep(poll_interval)
+            current = snapshot_plan_dir(directory)
+            changed = {name for name, signature in current.items() if snapshot.get(name) != signature}
+            snapshot = current
+            if changed:
+                yield changed
+
+    try:
+        while True:
+            names = read_inotify_names(fd, None)
+            # Editors save in bursts; coalesce them so one edit triggers one regeneration.
+            while True:
+                more = read_inotify_names(fd, debounce)
+                if not more:
+                    break
+                names |= more
+            yield names
+    finally:
+        os.close(fd)
+
+
+def watch_plans(
+    ctx: PlanContext,
+    carry_limit: int,
+    force: bool,
+    template_path: Path | None,
+    poll_interval: float,
+    profiler: StageProfiler = NULL_PROFILER,
+) -> None:
+    writer = NoteWriter(force=True)
+    print(f"[WATCH] {ctx.output_dir}: regenerating tomorrow's plan when today's changes (Ctrl+C to stop)")
+    for names in watch_changes(ctx.output_dir, poll_interval):
+        today = date.today()
+        if not any(name.startswith(today.isoformat()) and PLAN_NAME_RE.match(name) for name in names):
+            continue
+        tomorrow = today + timedelta(days=1)
+        target = plan_path(ctx, tomorrow)
+        stats = plan_file_stats(ctx.stats_cache, target)
+        if stats is not None and stats.get("generated") != stats["sha1"] and not force:
+            print(f"[KEEP] edited by hand, not regenerated: {target}")
+            continue
+        generate_plans(ctx, tomorrow, tomorrow, carry_limit, writer, template_path, profiler)
+        with profiler.stage("cache_save"):
+            save_plan_context(ctx)
+
+
+def run(parser: argparse.ArgumentParser, args: argparse.Namespace, profiler: StageProfiler) -> int:
+    if args.stats:
+        with profiler.stage("stats_collect"):
+            daily = collect_daily_stats(Path(args.output_dir), args.workers)
+        with profiler.stage("stats_summarize"):
+            summary = summarize_history(daily, parse_date(args.date), args.streak_threshold)
+        print(json.dumps(summary, ensure_ascii=False, indent=2) if args.json else format_history(summary))
+        return 0
+
+    try:
+        start, end = resolve_date_range(args)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    with profiler.stage("config_load"):
+        config = load_config(Path(args.config))
+    template_path = Path(args.template) if args.template else None
+    writer = NoteWriter(args.force, workers=args.write_workers)
+    try:
+        with profiler.stage("context_load"):
+            ctx = load_plan_context(config, Path(args.output_dir))
+        generate_plans(ctx, start, end, args.carry_limit, writer, template_path, profiler)
+    except ValueError as exc:
+        print(f"[ERROR] {exc}")
+        return 1
+    with profiler.stage("cache_save"):
+        save_plan_context(ctx)
+    if end > start:
+        print(f"[DONE] {start.isoformat()} ~ {end.isoformat()}: {writer.summary()}")
+
+    if args.watch:
+        try:
+            watch_plans(ctx, args.carry_limit, args.force, template_path, args.poll_interval, profiler)
+        except KeyboardInterrupt:
+            save_plan_context(ctx)
+            print("[WATCH] stopped")
+    return 0
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Generate minimal daily plan markdown.")
     parser.add_argument("--date", default=date.today().isoformat(), help="target date, format YYYY-MM-DD")
+    parser.add_argument("--start", help="first date of a range to generate, format YYYY-MM-DD (defaults to --date)")
+    parser.add_argument("--end", help="last date of the range (inclusive), format YYYY-MM-DD")
+    parser.add_argument("--days", type=int, default=1, help="number of consecutive days to generate when --end is not set")
     parser.add_argument(
         "--config",
         default=str(Path(__file__).resolve().parents[1] / "config" / "plan_config.example.json"),
         help="path to plan config json",
     )
     parser.add_argument("--output-dir", default="考研计划", help="output directory for generated plan")
+    parser.add_argument("--template", help="markdown template with {{date:YYYY-MM-DD}}-style placeholders")
     parser.add_argument("--carry-limit", type=int, default=5, help="max carry-over tasks from yesterday")
-    parser.add_argument("--force", action="store_true", help="overwrite output file if exists")
+    parser.add_argument("--force", action="store_true", help="overwrite output file if exists (identical files are left untouched)")
+    parser.add_argument("--write-workers", type=int, default=4, help="concurrent file writes when flushing a batch")
+    parser.add_argument("--watch", action="store_true", help="keep running and regenerate tomorrow's plan whenever today's plan changes")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="seconds between scans when inotify is unavailable")
+    parser.add_argument("--stats", action="store_true", help="print completion history of the output directory instead of generating")
+    parser.add_argument("--json", action="store_true", help="print --stats output as JSON")
+    parser.add_argument("--streak-threshold", type=float, default=0.8, help="daily completion rate that counts toward a streak")
+    parser.add_argument("--workers", type=int, default=8, help="parallel file readers for --stats")
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
-    today = parse_date(args.date)
-    config_path = Path(args.config)
-    output_dir = Path(args.output_dir)
-
-    config = load_config(config_path)
-    phase = choose_phase(today, config.get("phases", []))
-    weekday_name = get_weekday_name(today, config.get("weekday_names"))
-    templates = config.get("subject_templates", {})
-
-    output_dir.mkdir(parents=True, exist_ok=True)
-    output_path = output_dir / f"{today.isoformat()} {weekday_name}.md"
-    if output_path.exists() and not args.force:
-        print(f"[SKIP] output exists: {output_path}")
-        return 0
-
-    yesterday_file = find_yesterday_file(output_dir, today)
-    carry_tasks, yesterday_rate = parse_yesterday_stats(yesterday_file, args.carry_limit)
-    blocks = build_plan_blocks(phase.get("allocation", {}), templates)
-    content = render_markdown(today, weekday_name, phase, carry_tasks, yesterday_rate, blocks)
-    output_path.write_text(content, encoding="utf-8")
-    print(f"[OK] generated: {output_path}")
-    return 0
+    profiler = profiler_from_args(args)
+    try:
+        return run(parser, args, profiler)
+    finally:
+        profiler.close()
 
 
 if __name__ == "__main__":
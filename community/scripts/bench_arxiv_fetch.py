@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Compare per-request urlopen against the pooled gzip ArxivClient on a local fake arXiv server."""
+
+from __future__ import annotations
+
+import argparse
+import time
+import urllib.parse
+import urllib.request
+from typing import Callable
+
+from fake_arxiv_server import FakeArxivServer, start_server
+from paper_digest_min import CHUNK_SIZE, USER_AGENT, ArxivClient, build_query_params
+
+
+def fetch_urlopen(api_url: str, params: dict[str, str]) -> int:
+    req = urllib.request.Request(f"{api_url}?{urllib.parse.urlencode(params)}", headers={"User-Agent": USER_AGENT})
+    size = 0
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        while chunk := resp.read(CHUNK_SIZE):
+            size += len(chunk)
+    return size
+
+
+def bench(
+    name: str,
+    server: FakeArxivServer,
+    pages: int,
+    page_size: int,
+    fetch: Callable[[dict[str, str]], int],
+) -> None:
+    server.connections = server.requests = server.bytes_sent = 0
+    decoded = 0
+    started = time.perf_counter()
+    for page in range(pages):
+        decoded += fetch(build_query_params("all:bench", page_size, page * page_size))
+    elapsed = time.perf_counter() - started
+    print(
+        f"{name:<8} {elapsed * 1000:9.1f} ms  {server.connections:4d} conns  "
+        f"{server.bytes_sent / 1024:9.1f} KiB on wire  {decoded / 1024:9.1f} KiB xml"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark arXiv fetch strategies against a local stand-in server.")
+    parser.add_argument("--pages", type=int, default=20, help="number of paginated requests")
+    parser.add_argument("--page-size", type=int, default=100, help="entries per request")
+    parser.add_argument("--handshake-delay", type=float, default=0.05, help="simulated TCP+TLS setup per connection")
+    args = parser.parse_args()
+
+    server = start_server(args.pages * args.page_size, args.handshake_delay)
+    client = ArxivClient(server.url)
+
+    def fetch_pooled(params: dict[str, str]) -> int:
+        conn, resp = client.request(params, {})
+        return sum(len(chunk) for chunk in client.iter_body(conn, resp))
+
+    try:
+        print(f"{args.pages} pages x {args.page_size} entries, {args.handshake_delay * 1000:.0f} ms per new connection")
+        bench("urlopen", server, args.pages, args.page_size, lambda params: fetch_urlopen(server.url, params))
+        bench("pooled", server, args.pages, args.page_size, fetch_pooled)
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Local stand-in for the arXiv export API: synthetic feeds with tunable size, latency and failures."""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import math
+import random
+import re
+import socket
+import threading
+import time
+import urllib.parse
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from xml.sax.saxutils import escape
+
+TOPICS = [
+    "UAV trajectory optimization",
+    "integrated sensing and communication",
+    "reconfigurable intelligent surface",
+    "semantic communication",
+    "federated learning",
+    "channel estimation",
+]
+VOCABULARY = (
+    "beamforming channel latency throughput energy efficiency robust optimization convex relaxation "
+    "deep reinforcement learning outage probability secrecy rate multi-antenna base station user "
+    "scheduling resource allocation trajectory sensing accuracy radar waveform phase shift passive "
+    "active hybrid precoding semantic encoder decoder knowledge base transformer simulation results "
+    "demonstrate proposed scheme outperforms baseline significant gains under imperfect CSI"
+).split()
+BASE_TIME = datetime(2026, 3, 13, 18, 0, tzinfo=timezone.utc)
+ENTRY_SPACING = timedelta(minutes=37)
+WINDOW_RE = re.compile(r"submittedDate:\[(\d{12}) TO (\d{12})\]")
+
+
+def render_entry(index: int) -> str:
+    topic = TOPICS[index % len(TOPICS)]
+    other = TOPICS[(index * 7 + 3) % len(TOPICS)]
+    published = (BASE_TIME - ENTRY_SPACING * index).strftime("%Y-%m-%dT%H:%M:%SZ")
+    rng = random.Random(index)
+    summary = f"We study {topic} jointly with {other}. " + " ".join(rng.choices(VOCABULARY, k=150)) + "."
+    return (
+        "<entry>"
+        f"<id>http://arxiv.org/abs/2603.{index:05d}v1</id>"
+        f"<published>{published}</published>"
+        f"<title>{escape(topic.title())} for {escape(other)}: study {index}</title>"
+        f"<summary>{escape(summary)}</summary>"
+        f"<author><name>Author {index}</name></author><author><name>Coauthor {index % 97}</name></author>"
+        '<category term="cs.IT"/><category term="eess.SP"/>'
+        "</entry>"
+    )
+
+
+def matching_indexes(query: str, total: int) -> range:
+    # Entries are spaced evenly backwards from BASE_TIME, so a submittedDate window maps to an index range.
+    match = WINDOW_RE.search(query)
+    if match is None:
+        return range(total)
+    low, high = (datetime.strptime(stamp, "%Y%m%d%H%M").replace(tzinfo=timezone.utc) for stamp in match.groups())
+    first = max(0, math.ceil((BASE_TIME - high) / ENTRY_SPACING))
+    last = min(total - 1, math.floor((BASE_TIME - low) / ENTRY_SPACING))
+    return range(first, last + 1)
+
+
+def render_feed(indexes: range) -> bytes:
+    entries = "".join(render_entry(index) for index in indexes)
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<feed xmlns="http://www.w3.org/2005/Atom">'
+        f"<title>fake arXiv</title>{entries}</feed>"
+    ).encode("utf-8")
+
+
+class FakeArxivServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        entries: int = 1000,
+        handshake_delay: float = 0.0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        truncate_rate: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        super().__init__(address, FakeArxivHandler)
+        self.entries = entries
+        self.handshake_delay = handshake_delay
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.truncate_rate = truncate_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.errors = 0
+        self.bytes_sent = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api/query"
+
+    def count(self, field: str, amount: int = 1) -> None:
+        with self.lock:
+            setattr(self, field, getattr(self, field) + amount)
+
+    def roll(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self.lock:
+            return self.random.random() < rate
+
+
+class FakeArxivHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: FakeArxivServer
+
+    def setup(self) -> None:
+        super().setup()
+        # Headers and body go out in separate writes; without this Nagle stalls every keep-alive response.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.count("connections")
+        # Stand-in for the TCP + TLS round trips a real HTTPS connection costs.
+        if self.server.handshake_delay:
+            time.sleep(self.server.handshake_delay)
+
+    def do_GET(self) -> None:
+        server = self.server
+        server.count("requests")
+        if server.latency:
+            time.sleep(server.latency)
+        if server.roll(server.error_rate):
+            server.count("errors")
+            self.send_error(server.error_status, "injected failure")
+            return
+
+        params = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        start = int(params.get("start", ["0"])[0])
+        count = int(params.get("max_results", ["10"])[0])
+        etag = '"' + hashlib.sha1(self.path.encode("utf-8")).hexdigest()[:16] + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = render_feed(matching_indexes(params.get("search_query", [""])[0], server.entries)[start : start + count])
+        self.send_response(200)
+        self.send_header("Content-Type", "application/atom+xml; charset=utf-8")
+        self.send_header("ETag", etag)
+        if "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            body = gzip.compress(body, compresslevel=6)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if server.roll(server.truncate_rate):
+            # Promise the full length, send half, hang up: the client sees an incomplete read.
+            server.count("errors")
+            body = body[: len(body) // 2]
+            self.close_connection = True
+        server.count("bytes_sent", len(body))
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def start_server(entries: int = 1000, handshake_delay: float = 0.0, port: int = 0, **faults: Any) -> FakeArxivServer:
+    server = FakeArxivServer(("127.0.0.1", port), entries, handshake_delay, **faults)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve a fake arXiv Atom API on localhost.")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on")
+    parser.add_argument("--entries", type=int, default=1000, help="number of papers in the fake corpus")
+    parser.add_argument("--handshake-delay", type=float, default=0.0, help="seconds added to every new connection")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status used for injected errors")
+    parser.add_argument("--truncate-rate", type=float, default=0.0, help="fraction of responses cut off mid-body")
+    parser.add_argument("--seed", type=int, help="random seed for reproducible fault injection")
+    args = parser.parse_args()
+
+    server = FakeArxivServer(
+        ("127.0.0.1", args.port),
+        args.entries,
+        args.handshake_delay,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        truncate_rate=args.truncate_rate,
+        seed=args.seed,
+    )
+    print(f"[OK] fake arXiv API: {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Content-aware, atomic note writer shared by the community scripts."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+WRITTEN = "written"
+UNCHANGED = "unchanged"
+SKIPPED = "skipped"
+
+
+def same_content(path: Path, data: bytes, size: int) -> bool:
+    if size != len(data):
+        return False
+    return hashlib.sha256(path.read_bytes()).digest() == hashlib.sha256(data).digest()
+
+
+def write_note(path: Path, data: bytes, force: bool) -> str:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        stat = None
+    if stat is not None:
+        if not force:
+            return SKIPPED
+        # Rewriting identical bytes would only trigger an Obsidian re-index and a sync upload.
+        if same_content(path, data, stat.st_size):
+            return UNCHANGED
+
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return WRITTEN
+
+
+class NoteWriter:
+    def __init__(self, force: bool, workers: int = 4, batch_size: int = 32) -> None:
+        self.force = force
+        self.workers = max(workers, 1)
+        self.batch_size = max(batch_size, 1)
+        self.counts: Counter[str] = Counter()
+        self.pending: list[tuple[Path, bytes]] = []
+
+    def skip(self, path: Path) -> None:
+        self.counts[SKIPPED] += 1
+
+    def add(self, path: Path, content: str) -> list[tuple[Path, str]]:
+        self.pending.append((path, content.encode("utf-8")))
+        if len(self.pending) >= self.batch_size:
+            return self.flush()
+        return []
+
+    def flush(self) -> list[tuple[Path, str]]:
+        batch, self.pending = self.pending, []
+        if not batch:
+            return []
+        if len(batch) == 1 or self.workers == 1:
+            statuses = [write_note(path, data, self.force) for path, data in batch]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(batch))) as pool:
+                statuses = list(pool.map(lambda item: write_note(item[0], item[1], self.force), batch))
+        self.counts.update(statuses)
+        return [(path, status) for (path, _), status in zip(batch, statuses)]
+
+    def summary(self) -> str:
+        return f"written {self.counts[WRITTEN]}, unchanged {self.counts[UNCHANGED]}, skipped {self.counts[SKIPPED]}"
+
+
+def report(results: list[tuple[Path, str]]) -> None:
+    for path, status in results:
+        if status == WRITTEN:
+            print(f"[OK] generated: {path}")
+        elif status == UNCHANGED:
+            print(f"[SAME] unchanged: {path}")
+        else:
+            print(f"[SKIP] output exists: {path}")
@@ -4,15 +4,39 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import http.client
+import itertools
+import json
+import math
+import os
+import re
+import sqlite3
 import textwrap
-import urllib.error
+import threading
+import time
 import urllib.parse
-import urllib.request
 import xml.etree.ElementTree as ET
-from datetime import date
+import zlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
 from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from note_writer import SKIPPED, NoteWriter, report
+from stage_profiler import NULL_PROFILER, StageProfiler, add_profile_arguments, profiler_from_args
 
 ATOM_NS = {"atom": "http://www.w3.org/2005/Atom"}
+ARXIV_API_URL = "https://export.arxiv.org/api/query"
+ATOM_ENTRY_TAG = "{http://www.w3.org/2005/Atom}entry"
+USER_AGENT = "kaoyan-community-digest/1.0"
+CHUNK_SIZE = 64 * 1024
+TOKEN_RE = re.compile(r"[a-z0-9]+|[\u4e00-\u9fff]")
+PROFILE_STOPWORDS = frozenset({"a", "an", "and", "for", "in", "of", "on", "the", "to", "with"})
+ARXIV_ID_RE = re.compile(r"(?:/abs/)?([^/]+/\d+|\d+\.\d+)(?:v(\d+))?$")
+STATE_DB_NAME = ".paper_digest.sqlite"
+DEFAULT_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "kaoyan-community" / "arxiv"
 DEFAULT_QUERY = (
     'all:"UAV Trajectory Optimization" OR '
     'all:"ISAC" OR '
@@ -22,49 +46,604 @@ DEFAULT_QUERY = (
 )
 
 
-def fetch_arxiv_entries(query: str, max_results: int) -> list[dict[str, str]]:
+def build_query_params(query: str, max_results: int, start: int = 0) -> dict[str, str]:
     params = {
-        "search_query": query,
+        "search_query": " ".join(query.split()),
         "sortBy": "submittedDate",
         "sortOrder": "descending",
         "max_results": str(max_results),
     }
-    url = "https://export.arxiv.org/api/query?" + urllib.parse.urlencode(params)
-    req = urllib.request.Request(url, headers={"User-Agent": "kaoyan-community-digest/1.0"})
+    if start:
+        params["start"] = str(start)
+    return params
+
+
+def window_query(query: str, day: date) -> str:
+    # submittedDate is matched in GMT, the same clock arXiv uses for <published>.
+    stamp = day.strftime("%Y%m%d")
+    return f"({' '.join(query.split())}) AND submittedDate:[{stamp}0000 TO {stamp}2359]"
+
+
+class RateLimiter:
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.next_slot = 0.0
+
+    def wait(self) -> None:
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_slot - now
+            self.next_slot = max(now, self.next_slot) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+class FeedCache:
+    def __init__(self, directory: Path, ttl: float, offline: bool = False) -> None:
+        self.directory = directory
+        self.ttl = ttl
+        self.offline = offline
+
+    def key(self, api_url: str, params: dict[str, str]) -> str:
+        # The endpoint is part of the key: a local stand-in (--api-url) must never answer for the real arXiv.
+        query = urllib.parse.urlencode(sorted(params.items()))
+        return hashlib.sha256(f"{api_url}?{query}".encode("utf-8")).hexdigest()
+
+    def body_path(self, key: str) -> Path:
+        return self.directory / f"{key}.xml"
+
+    def load(self, key: str) -> dict[str, Any] | None:
+        try:
+            meta = json.loads((self.directory / f"{key}.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return meta if self.body_path(key).is_file() else None
+
+    def fresh(self, meta: dict[str, Any]) -> bool:
+        return self.offline or time.time() - meta.get("fetched_at", 0) < self.ttl
+
+    def iter_body(self, key: str) -> Iterator[bytes]:
+        with open(self.body_path(key), "rb") as handle:
+            while chunk := handle.read(CHUNK_SIZE):
+                yield chunk
+
+    def store_meta(self, key: str, meta: dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.directory / f"{key}.json.{os.getpid()}.tmp"
+        tmp_path.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp_path, self.directory / f"{key}.json")
+
+    def tee(self, key: str, meta: dict[str, Any], chunks: Iterable[bytes]) -> Iterator[bytes]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.directory / f"{key}.xml.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as handle:
+                for chunk in chunks:
+                    handle.write(chunk)
+                    yield chunk
+            # Body first, then metadata, so a reader never pairs new metadata with a torn body.
+            os.replace(tmp_path, self.body_path(key))
+            self.store_meta(key, meta)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+
+class ArxivClient:
+    def __init__(self, api_url: str = ARXIV_API_URL, timeout: float = 30, max_idle: int = 4) -> None:
+        parts = urllib.parse.urlsplit(api_url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"unsupported arXiv API URL: {api_url}")
+        self.api_url = api_url
+        self.connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = parts.path or "/"
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.idle: list[http.client.HTTPConnection] = []
+        self.lock = threading.Lock()
+        self.connections_opened = 0
+        self.bytes_received = 0
+
+    def url(self, params: dict[str, str]) -> str:
+        return f"{self.api_url}?{urllib.parse.urlencode(params)}"
+
+    def acquire(self) -> tuple[http.client.HTTPConnection, bool]:
+        with self.lock:
+            if self.idle:
+                return (self.idle.pop(), True)
+            self.connections_opened += 1
+        return (self.connection_class(self.host, self.port, timeout=self.timeout), False)
+
+    def release(self, conn: http.client.HTTPConnection, resp: http.client.HTTPResponse) -> None:
+        if not resp.will_close:
+            with self.lock:
+                if len(self.idle) < self.max_idle:
+                    self.idle.append(conn)
+                    return
+        conn.close()
+
+    def request(
+        self, params: dict[str, str], headers: dict[str, str]
+    ) -> tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        target = f"{self.path}?{urllib.parse.urlencode(params)}"
+        headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip", **headers}
+        while True:
+            conn, reused = self.acquire()
+            try:
+                conn.request("GET", target, headers=headers)
+                return (conn, conn.getresponse())
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                # The server timed out an idle keep-alive connection; only a fresh one is worth failing on.
+                if not reused:
+                    raise
+            except BaseException:
+                conn.close()
+                raise
+
+    def discard(self, conn: http.client.HTTPConnection, resp: http.client.HTTPResponse) -> None:
+        try:
+            resp.read()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            return
+        self.release(conn, resp)
+
+    def iter_body(self, conn: http.client.HTTPConnection, resp: http.client.HTTPResponse) -> Iterator[bytes]:
+        gzipped = (resp.getheader("Content-Encoding") or "").lower() == "gzip"
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS) if gzipped else None
+        complete = False
+        try:
+            while chunk := resp.read(CHUNK_SIZE):
+                with self.lock:
+                    self.bytes_received += len(chunk)
+                if decoder is not None:
+                    chunk = decoder.decompress(chunk)
+                if chunk:
+                    yield chunk
+            # http.client ends a short Content-Length body quietly instead of raising IncompleteRead.
+            if resp.length or (decoder is not None and not decoder.eof):
+                raise RuntimeError("failed to read arXiv response: connection closed mid-body")
+            if decoder is not None and (tail := decoder.flush()):
+                yield tail
+            complete = True
+        except (http.client.HTTPException, OSError, zlib.error) as exc:
+            raise RuntimeError(f"failed to read arXiv response: {exc}") from exc
+        finally:
+            # A half-read response leaves bytes on the socket, so only fully drained connections are reused.
+            if complete:
+                self.release(conn, resp)
+            else:
+                conn.close()
+
+    def close(self) -> None:
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for conn in idle:
+            conn.close()
+
+
+def open_arxiv_feed(
+    query: str,
+    max_results: int,
+    cache: FeedCache | None = None,
+    start: int = 0,
+    limiter: RateLimiter | None = None,
+    client: ArxivClient | None = None,
+) -> Iterator[bytes]:
+    if client is None:
+        client = ArxivClient(ARXIV_API_URL, max_idle=0)
+    params = build_query_params(query, max_results, start)
+    key = cache.key(client.api_url, params) if cache is not None else ""
+    meta = cache.load(key) if cache is not None else None
+    if meta is not None and cache.fresh(meta):
+        yield from cache.iter_body(key)
+        return
+    if cache is not None and cache.offline:
+        raise RuntimeError("offline mode: no cached arXiv response for this query")
+
+    headers = {}
+    if meta is not None:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+    if limiter is not None:
+        limiter.wait()
     try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            xml_text = resp.read().decode("utf-8", errors="replace")
-    except (urllib.error.URLError, TimeoutError, OSError) as exc:
+        conn, resp = client.request(params, headers)
+    except (http.client.HTTPException, TimeoutError, OSError) as exc:
+        if meta is not None:
+            print(f"[WARN] arXiv unreachable, using cached response from {time.ctime(meta['fetched_at'])}: {exc}")
+            yield from cache.iter_body(key)
+            return
         raise RuntimeError(f"failed to fetch arXiv API: {exc}") from exc
+    if resp.status == 304 and meta is not None:
+        client.discard(conn, resp)
+        meta["fetched_at"] = time.time()
+        cache.store_meta(key, meta)
+        yield from cache.iter_body(key)
+        return
+    if resp.status != 200:
+        client.discard(conn, resp)
+        raise RuntimeError(f"failed to fetch arXiv API: HTTP Error {resp.status}: {resp.reason}")
+
+    body = client.iter_body(conn, resp)
+    if cache is None:
+        yield from body
+        return
+    fresh_meta = {
+        "url": client.url(params),
+        "fetched_at": time.time(),
+        "etag": resp.getheader("ETag"),
+        "last_modified": resp.getheader("Last-Modified"),
+    }
+    yield from cache.tee(key, fresh_meta, body)
+
 
+def entry_from_node(node: ET.Element) -> dict[str, str]:
+    title = (node.findtext("atom:title", default="", namespaces=ATOM_NS) or "").strip().replace("\n", " ")
+    summary = (node.findtext("atom:summary", default="", namespaces=ATOM_NS) or "").strip()
+    entry_id = (node.findtext("atom:id", default="", namespaces=ATOM_NS) or "").strip()
+    published = (node.findtext("atom:published", default="", namespaces=ATOM_NS) or "")[:10]
+    author_nodes = node.findall("atom:author/atom:name", ATOM_NS)
+    authors = ", ".join((author.text or "").strip() for author in author_nodes[:6] if author.text)
+    if len(author_nodes) > 6:
+        authors += ", et al."
+    category_nodes = node.findall("atom:category", ATOM_NS)
+    categories = " ".join(f"`{tag.attrib.get('term', '')}`" for tag in category_nodes if tag.attrib.get("term"))
+
+    return {
+        "title": title,
+        "summary": summary,
+        "id": entry_id,
+        "published": published,
+        "authors": authors or "Unknown",
+        "categories": categories or "`N/A`",
+    }
+
+
+def iter_feed_entries(chunks: Iterable[bytes]) -> Iterator[dict[str, str]]:
+    parser = ET.XMLPullParser(events=("start", "end"))
+    root: ET.Element | None = None
     try:
-        root = ET.fromstring(xml_text)
+        for chunk in chunks:
+            parser.feed(chunk)
+            for event, node in parser.read_events():
+                if event == "start":
+                    if root is None:
+                        root = node
+                elif node.tag == ATOM_ENTRY_TAG:
+                    yield entry_from_node(node)
+                    # Drop the finished entry so memory stays flat however long the feed is.
+                    node.clear()
+                    if root is not None:
+                        root.remove(node)
+        parser.close()
     except ET.ParseError as exc:
         raise RuntimeError(f"failed to parse arXiv response: {exc}") from exc
-    entries: list[dict[str, str]] = []
-    for node in root.findall("atom:entry", ATOM_NS):
-        title = (node.findtext("atom:title", default="", namespaces=ATOM_NS) or "").strip().replace("\n", " ")
-        summary = (node.findtext("atom:summary", default="", namespaces=ATOM_NS) or "").strip()
-        entry_id = (node.findtext("atom:id", default="", namespaces=ATOM_NS) or "").strip()
-        published = (node.findtext("atom:published", default="", namespaces=ATOM_NS) or "")[:10]
-        author_nodes = node.findall("atom:author/atom:name", ATOM_NS)
-        authors = ", ".join((author.text or "").strip() for author in author_nodes[:6] if author.text)
-        if len(author_nodes) > 6:
-            authors += ", et al."
-        category_nodes = node.findall("atom:category", ATOM_NS)
-        categories = " ".join(f"`{tag.attrib.get('term', '')}`" for tag in category_nodes if tag.attrib.get("term"))
-
-        entries.append(
-            {
-                "title": title,
-                "summary": summary,
-                "id": entry_id,
-                "published": published,
-                "authors": authors or "Unknown",
-                "categories": categories or "`N/A`",
-            }
+
+
+def timed_chunks(chunks: Iterable[bytes], totals: list[float]) -> Iterator[bytes]:
+    iterator = iter(chunks)
+    while True:
+        started = time.perf_counter()
+        chunk = next(iterator, None)
+        totals[0] += time.perf_counter() - started
+        if chunk is None:
+            return
+        totals[1] += len(chunk)
+        yield chunk
+
+
+def iter_arxiv_entries(
+    query: str,
+    max_results: int,
+    cache: FeedCache | None = None,
+    page_size: int = 100,
+    limiter: RateLimiter | None = None,
+    profiler: StageProfiler = NULL_PROFILER,
+    client: ArxivClient | None = None,
+) -> Iterator[dict[str, str]]:
+    start = 0
+    while start < max_results:
+        size = min(page_size, max_results - start)
+        # [seconds waiting on the network or cache, bytes received]
+        fetch_totals = [0.0, 0.0]
+        chunks = timed_chunks(open_arxiv_feed(query, size, cache, start, limiter, client), fetch_totals)
+        count = 0
+        active = 0.0
+        resumed = time.perf_counter()
+        for entry in iter_feed_entries(chunks):
+            active += time.perf_counter() - resumed
+            count += 1
+            yield entry
+            resumed = time.perf_counter()
+        active += time.perf_counter() - resumed
+        profiler.record("fetch", fetch_totals[0], start=start, max_results=size, bytes=int(fetch_totals[1]))
+        profiler.record("parse", active - fetch_totals[0], start=start, entries=count)
+        if count < size:
+            break
+        start += count
+
+
+def split_arxiv_id(entry_id: str) -> tuple[str, int]:
+    match = ARXIV_ID_RE.search(entry_id.strip())
+    if match is None:
+        return (entry_id.strip(), 0)
+    return (match.group(1), int(match.group(2) or 0))
+
+
+def merge_entries(batches: Iterable[list[dict[str, str]]]) -> list[dict[str, str]]:
+    merged: dict[str, dict[str, str]] = {}
+    for entries in batches:
+        for entry in entries:
+            arxiv_id, version = split_arxiv_id(entry["id"])
+            seen = merged.get(arxiv_id)
+            if seen is None or split_arxiv_id(seen["id"])[1] < version:
+                merged[arxiv_id] = entry
+    return sorted(merged.values(), key=lambda entry: (entry["published"], entry["id"]), reverse=True)
+
+
+def iter_query_entries(
+    queries: list[str],
+    max_results: int,
+    cache: FeedCache | None = None,
+    page_size: int = 100,
+    limiter: RateLimiter | None = None,
+    profiler: StageProfiler = NULL_PROFILER,
+    workers: int = 4,
+    client: ArxivClient | None = None,
+) -> Iterator[dict[str, str]]:
+    if len(queries) == 1:
+        yield from iter_arxiv_entries(queries[0], max_results, cache, page_size, limiter, profiler, client)
+        return
+    # All queries share one limiter, so overlapping them only hides network latency, never the arXiv delay.
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(queries)))) as pool:
+        batches = pool.map(
+            lambda query: list(iter_arxiv_entries(query, max_results, cache, page_size, limiter, profiler, client)),
+            queries,
+        )
+        yield from merge_entries(batches)
+
+
+class DigestStore:
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_papers ("
+            "arxiv_id TEXT PRIMARY KEY, version INTEGER NOT NULL, digest_date TEXT NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS papers ("
+            "rowid INTEGER PRIMARY KEY, arxiv_id TEXT NOT NULL UNIQUE, link TEXT NOT NULL, "
+            "published TEXT NOT NULL, digest_date TEXT NOT NULL)"
+        )
+        self.conn.execute("CREATE TABLE IF NOT EXISTS ranked_papers (arxiv_id TEXT PRIMARY KEY) WITHOUT ROWID")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS term_stats (term TEXT PRIMARY KEY, df INTEGER NOT NULL) WITHOUT ROWID")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS corpus_stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self.search_enabled = self.create_search_table()
+        self.pending: list[dict[str, str]] = []
+
+    def create_search_table(self) -> bool:
+        # Trigram tokens (SQLite >= 3.34) match substrings, so Chinese and English both work without a segmenter.
+        for tokenize in ("trigram", "unicode61"):
+            try:
+                self.conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS paper_fts "
+                    f"USING fts5(title, summary, authors, categories, tokenize='{tokenize}')"
+                )
+                return True
+            except sqlite3.OperationalError:
+                continue
+        print("[WARN] SQLite FTS5 is unavailable, the paper search index is disabled")
+        return False
+
+    def is_seen(self, arxiv_id: str, version: int, digest_date: str) -> bool:
+        # One primary-key probe per entry: O(log n) and no need to hold every id in memory.
+        row = self.conn.execute(
+            "SELECT version, digest_date FROM seen_papers WHERE arxiv_id = ?",
+            (arxiv_id,),
+        ).fetchone()
+        # Papers first listed on this date stay in its digest when it is regenerated; revisions resurface.
+        return row is not None and row[1] != digest_date and row[0] >= version
+
+    def filter_unseen(
+        self,
+        entries: Iterable[dict[str, str]],
+        digest_date: str,
+        include_seen: bool = False,
+    ) -> Iterator[dict[str, str]]:
+        for entry in entries:
+            arxiv_id, version = split_arxiv_id(entry["id"])
+            if not include_seen and self.is_seen(arxiv_id, version, digest_date):
+                continue
+            yield entry
+
+    def track(self, entries: Iterable[dict[str, str]]) -> Iterator[dict[str, str]]:
+        for entry in entries:
+            self.pending.append(entry)
+            yield entry
+
+    def mark_pending(self, digest_date: str) -> None:
+        with self.conn:
+            for entry in self.pending:
+                arxiv_id, version = split_arxiv_id(entry["id"])
+                self.conn.execute(
+                    "INSERT INTO seen_papers (arxiv_id, version, digest_date) VALUES (?, ?, ?) "
+                    "ON CONFLICT(arxiv_id) DO UPDATE SET version = excluded.version, "
+                    "digest_date = excluded.digest_date WHERE excluded.version > seen_papers.version",
+                    (arxiv_id, version, digest_date),
+                )
+                if self.search_enabled:
+                    self.index_entry(arxiv_id, entry, digest_date)
+        self.pending.clear()
+
+    def index_entry(self, arxiv_id: str, entry: dict[str, str], digest_date: str) -> None:
+        row = self.conn.execute("SELECT rowid FROM papers WHERE arxiv_id = ?", (arxiv_id,)).fetchone()
+        if row is None:
+            rowid = self.conn.execute(
+                "INSERT INTO papers (arxiv_id, link, published, digest_date) VALUES (?, ?, ?, ?)",
+                (arxiv_id, entry["id"], entry["published"], digest_date),
+            ).lastrowid
+        else:
+            rowid = row[0]
+            self.conn.execute("UPDATE papers SET link = ?, published = ? WHERE rowid = ?", (entry["id"], entry["published"], rowid))
+            self.conn.execute("DELETE FROM paper_fts WHERE rowid = ?", (rowid,))
+        self.conn.execute(
+            "INSERT INTO paper_fts (rowid, title, summary, authors, categories) VALUES (?, ?, ?, ?, ?)",
+            (rowid, entry["title"], entry["summary"], entry["authors"], entry["categories"]),
+        )
+
+    def update_term_stats(
+        self,
+        docs: list[tuple[dict[str, str], Counter[str], int]],
+        terms: Iterable[str],
+    ) -> tuple[int, int, dict[str, int]]:
+        # Document frequencies accumulate across runs (each paper counted once), so IDF reflects
+        # everything ever fetched rather than just today's candidates.
+        with self.conn:
+            for entry, tf, length in docs:
+                arxiv_id = split_arxiv_id(entry["id"])[0]
+                inserted = self.conn.execute(
+                    "INSERT OR IGNORE INTO ranked_papers (arxiv_id) VALUES (?)", (arxiv_id,)
+                ).rowcount
+                if not inserted:
+                    continue
+                self.conn.executemany(
+                    "INSERT INTO term_stats (term, df) VALUES (?, 1) ON CONFLICT(term) DO UPDATE SET df = df + 1",
+                    [(term,) for term in tf],
+                )
+                self.conn.executemany(
+                    "INSERT INTO corpus_stats (name, value) VALUES (?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                    [("doc_count", 1), ("total_length", length)],
+                )
+        stats = dict(self.conn.execute("SELECT name, value FROM corpus_stats").fetchall())
+        terms = list(terms)
+        placeholders = ", ".join("?" for _ in terms)
+        df = dict(self.conn.execute(f"SELECT term, df FROM term_stats WHERE term IN ({placeholders})", terms).fetchall())
+        return (stats.get("doc_count", 0), stats.get("total_length", 0), df)
+
+    def search(self, text: str, limit: int = 20) -> list[tuple[str, str, str, str, str, str]]:
+        terms = text.split()
+        if not terms or not self.search_enabled:
+            return []
+        # Trigram MATCH needs 3+ characters; shorter terms (e.g. two-character Chinese words) fall back to instr().
+        long_terms = [term for term in terms if len(term) >= 3]
+        short_terms = [term.lower() for term in terms if len(term) < 3]
+        where = []
+        params: list[Any] = []
+        if long_terms:
+            where.append("paper_fts MATCH ?")
+            params.append(" ".join('"' + term.replace('"', '""') + '"' for term in long_terms))
+        for term in short_terms:
+            where.append(
+                "(instr(lower(paper_fts.title), ?) > 0 OR instr(lower(paper_fts.summary), ?) > 0 "
+                "OR instr(lower(paper_fts.authors), ?) > 0)"
+            )
+            params.extend([term, term, term])
+        order = "bm25(paper_fts, 10.0, 1.0, 3.0, 2.0)" if long_terms else "papers.published DESC"
+        query = (
+            "SELECT papers.arxiv_id, papers.link, papers.published, papers.digest_date, paper_fts.title, "
+            "snippet(paper_fts, -1, '**', '**', '…', 64) "
+            "FROM paper_fts JOIN papers ON papers.rowid = paper_fts.rowid "
+            f"WHERE {' AND '.join(where)} ORDER BY {order} LIMIT ?"
+        )
+        return self.conn.execute(query, (*params, limit)).fetchall()
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def print_search_results(results: list[tuple[str, str, str, str, str, str]], output_dir: Path) -> None:
+    if not results:
+        print("[SEARCH] no matching papers")
+        return
+    for arxiv_id, link, published, digest_date, title, snippet in results:
+        print(f"- {published} [{arxiv_id}]({link}) {title}")
+        print(f"  日报：[[{output_dir.name}/{digest_date}]] · {' '.join(snippet.split())}")
+
+
+def tokenize(text: str) -> list[str]:
+    # Crude plural folding so "surfaces" matches "surface"; applied to keywords and documents alike.
+    return [
+        token[:-1] if len(token) > 3 and token.endswith("s") and not token.endswith("ss") else token
+        for token in TOKEN_RE.findall(text.lower())
+    ]
+
+
+def load_rank_profile(path: Path) -> dict[str, Any]:
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    terms: dict[str, float] = {}
+    for keyword, weight in raw.get("keywords", {}).items():
+        for term in tokenize(keyword):
+            if term in PROFILE_STOPWORDS:
+                continue
+            terms[term] = terms.get(term, 0.0) + float(weight)
+    if not terms:
+        raise ValueError(f"rank profile has no keywords: {path}")
+    return {
+        "terms": terms,
+        "fields": raw.get("fields", {"title": 2.0, "summary": 1.0}),
+        "k1": float(raw.get("k1", 1.2)),
+        "b": float(raw.get("b", 0.75)),
+    }
+
+
+def rank_entries(
+    entries: Iterable[dict[str, str]],
+    profile: dict[str, Any],
+    store: DigestStore,
+    top: int | None = None,
+) -> list[dict[str, str]]:
+    docs: list[tuple[dict[str, str], Counter[str], int]] = []
+    for entry in entries:
+        tf: Counter[str] = Counter()
+        length = 0
+        for field, weight in profile["fields"].items():
+            tokens = tokenize(entry.get(field, ""))
+            length += len(tokens)
+            for token in tokens:
+                tf[token] += weight
+        docs.append((entry, tf, length))
+    if not docs:
+        return []
+
+    terms = profile["terms"]
+    doc_count, total_length, df = store.update_term_stats(docs, terms)
+    doc_count = max(doc_count, len(docs))
+    avgdl = (total_length / doc_count) if total_length else 1.0
+    idf = {term: math.log(1 + (doc_count - df.get(term, 0) + 0.5) / (df.get(term, 0) + 0.5)) for term in terms}
+    k1, b = profile["k1"], profile["b"]
+
+    scored = []
+    for entry, tf, length in docs:
+        norm = k1 * (1 - b + b * length / avgdl)
+        score = sum(
+            weight * idf[term] * tf[term] * (k1 + 1) / (tf[term] + norm)
+            for term, weight in terms.items()
+            if tf[term]
         )
-    return entries
+        scored.append((score, entry))
+    # sort() is stable, so equally relevant papers keep their submittedDate order.
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return [entry for _, entry in scored[:top]]
+
+
+def read_queries(values: list[str] | None, query_file: str | None) -> list[str]:
+    queries = list(values or [])
+    if query_file:
+        for line in Path(query_file).read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                queries.append(line)
+    return queries or [DEFAULT_QUERY]
 
 
 def summary_callout(summary: str, max_chars: int = 800) -> str:
@@ -75,13 +654,47 @@ def summary_callout(summary: str, max_chars: int = 800) -> str:
     return "\n".join(f"> {line}" for line in wrapped)
 
 
-def render_markdown(target_date: date, entries: list[dict[str, str]], query: str) -> str:
+def render_entry(idx: int, entry: dict[str, str]) -> list[str]:
+    return [
+        f"## {idx}. {entry['title']}",
+        "",
+        f"- 链接：[{entry['id']}]({entry['id']})",
+        f"- 日期：{entry['published']}",
+        f"- 作者：{entry['authors']}",
+        f"- 分类：{entry['categories']}",
+        "",
+        "> [!abstract] 原始摘要（截断）",
+        summary_callout(entry["summary"]),
+        "",
+        "---",
+        "",
+    ]
+
+
+def render_markdown(
+    target_date: date,
+    entries: Iterable[dict[str, str]],
+    query: str,
+    profiler: StageProfiler = NULL_PROFILER,
+) -> str:
+    # Entries may be a generator still paging through arXiv; each one is rendered as it arrives
+    # and only the render time (not the wait for the next page) is attributed to the render stage.
+    body: list[str] = []
+    count = 0
+    render_seconds = 0.0
+    for entry in entries:
+        started = time.perf_counter()
+        count += 1
+        body.extend(render_entry(count, entry))
+        render_seconds += time.perf_counter() - started
+
+    started = time.perf_counter()
     lines = [
         "---",
         f"date: {target_date.isoformat()}",
         "type: paper-digest",
         "source: arxiv",
-        f"paper_count: {len(entries)}",
+        f"paper_count: {count}",
         "tags:",
         "  - paper-digest",
         "  - arxiv",
@@ -96,7 +709,7 @@ def render_markdown(target_date: date, entries: list[dict[str, str]], query: str
         "",
     ]
 
-    if not entries:
+    if not count:
         lines.extend(
             [
                 "> [!warning] 无结果",
@@ -104,56 +717,163 @@ def render_markdown(target_date: date, entries: list[dict[str, str]], query: str
                 "",
             ]
         )
-        return "\n".join(lines) + "\n"
+        content = "\n".join(lines) + "\n"
+    else:
+        lines.extend(body)
+        content = "\n".join(lines)
+    profiler.record("render", render_seconds + time.perf_counter() - started, entries=count)
+    return content
 
-    for idx, entry in enumerate(entries, start=1):
-        lines.extend(
-            [
-                f"## {idx}. {entry['title']}",
-                "",
-                f"- 链接：[{entry['id']}]({entry['id']})",
-                f"- 日期：{entry['published']}",
-                f"- 作者：{entry['authors']}",
-                f"- 分类：{entry['categories']}",
-                "",
-                "> [!abstract] 原始摘要（截断）",
-                summary_callout(entry["summary"]),
-                "",
-                "---",
-                "",
-            ]
-        )
 
-    return "\n".join(lines)
+def resolve_days(args: argparse.Namespace) -> list[date]:
+    if not args.start and not args.end:
+        return [date.fromisoformat(args.date)]
+    start = date.fromisoformat(args.start or args.end)
+    end = date.fromisoformat(args.end or args.start)
+    if end < start:
+        raise ValueError(f"end date {end.isoformat()} is before start date {start.isoformat()}")
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(description="Generate minimal arXiv digest note.")
-    parser.add_argument("--date", default=date.today().isoformat(), help="target date, format YYYY-MM-DD")
-    parser.add_argument("--query", default=DEFAULT_QUERY, help="arXiv query expression")
-    parser.add_argument("--max-results", type=int, default=5, help="number of papers to fetch")
-    parser.add_argument("--output-dir", default="论文日报", help="directory for output markdown")
-    parser.add_argument("--force", action="store_true", help="overwrite file if exists")
-    args = parser.parse_args()
+def digest_day(
+    args: argparse.Namespace,
+    target_date: date,
+    queries: list[str],
+    cache: FeedCache | None,
+    limiter: RateLimiter,
+    client: ArxivClient,
+    store: DigestStore,
+    rank_profile: dict[str, Any] | None,
+    profiler: StageProfiler,
+) -> list[tuple[Path, str]]:
+    output_path = Path(args.output_dir) / f"{target_date.isoformat()}.md"
+    entries = iter_query_entries(
+        queries, args.max_results, cache, args.page_size, limiter, profiler, args.workers, client
+    )
+    entries = store.filter_unseen(entries, target_date.isoformat(), args.include_seen)
+    if rank_profile is not None:
+        candidates = list(entries)
+        with profiler.stage("rank", candidates=len(candidates)):
+            entries = rank_entries(candidates, rank_profile, store, args.top)
+    elif args.top is not None:
+        entries = itertools.islice(entries, args.top)
+    content = render_markdown(target_date, store.track(entries), " | ".join(queries), profiler)
+    with profiler.stage("write"):
+        writer = NoteWriter(args.force)
+        results = writer.add(output_path, content) + writer.flush()
+    if any(status != SKIPPED for _, status in results):
+        store.mark_pending(target_date.isoformat())
+    else:
+        store.pending.clear()
+    return results
+
 
-    target_date = date.fromisoformat(args.date)
+def run(args: argparse.Namespace, profiler: StageProfiler) -> int:
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
-    output_path = output_dir / f"{target_date.isoformat()}.md"
 
-    if output_path.exists() and not args.force:
-        print(f"[SKIP] output exists: {output_path}")
+    if args.search is not None:
+        store = DigestStore(Path(args.state_db) if args.state_db else output_dir / STATE_DB_NAME)
+        try:
+            with profiler.stage("search"):
+                results = store.search(args.search, args.limit)
+        finally:
+            store.close()
+        print_search_results(results, output_dir)
         return 0
 
     try:
-        entries = fetch_arxiv_entries(args.query, args.max_results)
-    except RuntimeError as exc:
+        days = resolve_days(args)
+    except ValueError as exc:
         print(f"[ERROR] {exc}")
         return 1
-    content = render_markdown(target_date, entries, args.query)
-    output_path.write_text(content, encoding="utf-8")
-    print(f"[OK] generated: {output_path}")
-    return 0
+    backfill = bool(args.start or args.end)
+    pending_days = []
+    for day in days:
+        output_path = output_dir / f"{day.isoformat()}.md"
+        if output_path.exists() and not args.force:
+            print(f"[SKIP] output exists: {output_path}")
+        else:
+            pending_days.append(day)
+    if not pending_days:
+        return 0
+
+    cache = None if args.no_cache else FeedCache(Path(args.cache_dir), args.cache_ttl, args.offline)
+    limiter = RateLimiter(args.page_delay)
+    try:
+        client = ArxivClient(args.api_url, max_idle=max(args.workers, 1))
+    except ValueError as exc:
+        print(f"[ERROR] {exc}")
+        return 1
+    try:
+        queries = read_queries(args.query, args.query_file)
+    except OSError as exc:
+        print(f"[ERROR] failed to read query file: {exc}")
+        return 1
+    try:
+        rank_profile = load_rank_profile(Path(args.rank_profile)) if args.rank_profile else None
+    except (OSError, ValueError) as exc:
+        print(f"[ERROR] failed to load rank profile: {exc}")
+        return 1
+    store = DigestStore(Path(args.state_db) if args.state_db else output_dir / STATE_DB_NAME)
+    failed = 0
+    try:
+        # Oldest first, so the seen-paper filter attributes cross-listed papers to their earliest day.
+        for day in pending_days:
+            day_queries = [window_query(query, day) for query in queries] if backfill else queries
+            try:
+                results = digest_day(args, day, day_queries, cache, limiter, client, store, rank_profile, profiler)
+            except RuntimeError as exc:
+                store.pending.clear()
+                print(f"[ERROR] {day.isoformat()}: {exc}" if backfill else f"[ERROR] {exc}")
+                failed += 1
+                continue
+            report(results)
+    finally:
+        store.close()
+        client.close()
+    return 1 if failed else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Generate minimal arXiv digest note.")
+    parser.add_argument("--date", default=date.today().isoformat(), help="target date, format YYYY-MM-DD")
+    parser.add_argument("--start", help="backfill: first date to digest, format YYYY-MM-DD")
+    parser.add_argument("--end", help="backfill: last date to digest (inclusive), format YYYY-MM-DD")
+    parser.add_argument("--query", action="append", help="arXiv query expression, repeat for several interest areas")
+    parser.add_argument("--query-file", help="file with one arXiv query per line (# starts a comment)")
+    parser.add_argument("--max-results", type=int, default=5, help="number of papers to fetch per query")
+    parser.add_argument("--workers", type=int, default=4, help="queries fetched concurrently")
+    parser.add_argument("--rank-profile", help="JSON keyword profile; candidates are ranked with BM25 before rendering")
+    parser.add_argument("--top", type=int, help="render only the best N papers (use a larger --max-results to over-fetch)")
+    parser.add_argument("--api-url", default=ARXIV_API_URL, help="arXiv API endpoint (http:// works for a local stand-in)")
+    parser.add_argument("--page-size", type=int, default=100, help="results requested per arXiv API call")
+    parser.add_argument("--page-delay", type=float, default=3.0, help="minimum seconds between arXiv API calls")
+    parser.add_argument("--output-dir", default="论文日报", help="directory for output markdown")
+    parser.add_argument("--force", action="store_true", help="overwrite file if exists (identical files are left untouched)")
+    parser.add_argument("--state-db", help=f"SQLite file remembering digested papers (default: <output-dir>/{STATE_DB_NAME})")
+    parser.add_argument("--include-seen", action="store_true", help="also list papers that appeared in earlier digests")
+    parser.add_argument("--search", metavar="TEXT", help="search previously digested papers instead of fetching")
+    parser.add_argument("--limit", type=int, default=20, help="max results for --search")
+    parser.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR), help="directory for cached arXiv responses")
+    parser.add_argument("--cache-ttl", type=float, default=3600, help="seconds a cached response is reused without revalidation")
+    parser.add_argument("--no-cache", action="store_true", help="always fetch from arXiv and do not store responses")
+    parser.add_argument("--offline", action="store_true", help="only use cached responses, never touch the network")
+    add_profile_arguments(parser)
+    return parser
+
+
+def main() -> int:
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.offline and args.no_cache:
+        parser.error("--offline needs the response cache, drop --no-cache")
+
+    profiler = profiler_from_args(args)
+    try:
+        return run(args, profiler)
+    finally:
+        profiler.close()
 
 
 if __name__ == "__main__":
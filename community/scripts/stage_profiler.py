@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""JSON-lines stage timings (plus optional cProfile/tracemalloc) for the community scripts."""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Iterator, TextIO
+
+
+class StageProfiler:
+    def __init__(
+        self,
+        sink: TextIO | None = None,
+        cprofile_path: str | None = None,
+        trace_memory: bool = False,
+    ) -> None:
+        self.sink = sink
+        self.enabled = sink is not None
+        self.trace_memory = trace_memory and self.enabled
+        self.cprofile_path = cprofile_path
+        self.cprofile = cProfile.Profile() if cprofile_path else None
+        self.lock = threading.Lock()
+        if self.trace_memory:
+            tracemalloc.start()
+        if self.cprofile is not None:
+            self.cprofile.enable()
+
+    @contextmanager
+    def stage(self, name: str, **fields: Any) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, **fields)
+
+    def record(self, name: str, seconds: float, **fields: Any) -> None:
+        if not self.enabled:
+            return
+        record: dict[str, Any] = {"stage": name, "ms": round(seconds * 1000, 3)}
+        record.update(fields)
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            record["mem_kb"] = current // 1024
+            record["peak_kb"] = peak // 1024
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self.lock:
+            self.sink.write(line)
+
+    def close(self) -> None:
+        if self.cprofile is not None:
+            self.cprofile.disable()
+            self.cprofile.dump_stats(self.cprofile_path)
+            self.cprofile = None
+        if self.trace_memory:
+            tracemalloc.stop()
+            self.trace_memory = False
+        if self.sink is not None and self.sink is not sys.stderr:
+            self.sink.close()
+        self.sink = None
+        self.enabled = False
+
+
+NULL_PROFILER = StageProfiler()
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="-",
+        metavar="PATH",
+        help="append JSON-lines stage timings to PATH (stderr when no PATH is given)",
+    )
+    parser.add_argument("--profile-cprofile", metavar="PATH", help="dump cProfile stats of the whole run to PATH")
+    parser.add_argument("--profile-memory", action="store_true", help="add tracemalloc current/peak KiB to each stage")
+
+
+def profiler_from_args(args: argparse.Namespace) -> StageProfiler:
+    if not args.profile and not args.profile_cprofile:
+        return NULL_PROFILER
+    sink: TextIO | None = None
+    if args.profile == "-":
+        sink = sys.stderr
+    elif args.profile:
+        sink = open(args.profile, "a", encoding="utf-8")
+    return StageProfiler(sink, args.profile_cprofile, args.profile_memory)
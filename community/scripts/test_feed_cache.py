@@ -0,0 +1,53 @@
+"""FeedCache must keep responses from different --api-url endpoints apart (python -m unittest test_feed_cache)."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from fake_arxiv_server import start_server
+from paper_digest_min import ARXIV_API_URL, ArxivClient, FeedCache, build_query_params, open_arxiv_feed
+
+
+class FeedCacheEndpointTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.tmp.name)
+        self.servers = [start_server(entries=entries) for entries in (3, 5)]
+        self.clients = [
+            ArxivClient(f"http://127.0.0.1:{server.server_address[1]}/api/query") for server in self.servers
+        ]
+
+    def tearDown(self) -> None:
+        for client in self.clients:
+            client.close()
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+        self.tmp.cleanup()
+
+    def fetch(self, client: ArxivClient, offline: bool = False) -> bytes:
+        cache = FeedCache(self.cache_dir, ttl=3600, offline=offline)
+        return b"".join(open_arxiv_feed("cat:cs.IT", 10, cache=cache, client=client))
+
+    def test_keys_differ_per_endpoint(self) -> None:
+        cache = FeedCache(self.cache_dir, ttl=3600)
+        params = build_query_params("cat:cs.IT", 10)
+        keys = {cache.key(url, params) for url in (ARXIV_API_URL, *(client.api_url for client in self.clients))}
+        self.assertEqual(len(keys), 3)
+
+    def test_endpoints_never_share_an_entry(self) -> None:
+        first = self.fetch(self.clients[0])
+        second = self.fetch(self.clients[1])
+        self.assertEqual(first.count(b"<entry>"), 3)
+        self.assertEqual(second.count(b"<entry>"), 5)
+        # Both are now served from the cache, each from its own entry.
+        self.assertEqual(self.fetch(self.clients[0], offline=True), first)
+        self.assertEqual(self.fetch(self.clients[1], offline=True), second)
+        with self.assertRaises(RuntimeError):
+            self.fetch(ArxivClient(ARXIV_API_URL), offline=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
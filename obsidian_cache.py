@@ -0,0 +1,137 @@
+"""In-process read-through LRU in front of mcp-obsidian reads (OBSIDIAN_CACHE=1)."""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable
+
+from mcp_obsidian import obsidian
+
+
+class ReadCache:
+    def __init__(self, max_entries: int = 256, vault_root: Path | None = None, ttl: float = 5.0) -> None:
+        self.max_entries = max(max_entries, 1)
+        self.vault_root = vault_root
+        self.ttl = ttl
+        self.entries: OrderedDict[tuple[str, str], tuple[Any, tuple[int, int] | None, float]] = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def validator(self, relpath: str) -> tuple[int, int] | None:
+        # Directory mtimes change when entries are added or removed, which is all a listing depends on.
+        if self.vault_root is None:
+            return None
+        try:
+            stat = (self.vault_root / relpath.strip("/")).stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def get(self, kind: str, relpath: str, load: Callable[[], Any]) -> Any:
+        key = (kind, relpath.strip("/"))
+        current = self.validator(key[1])
+        with self.lock:
+            cached = self.entries.get(key)
+            if cached is not None:
+                value, validator, stored_at = cached
+                if validator is not None and validator == current:
+                    fresh = True
+                else:
+                    # Without a local copy of the vault, fall back to a short TTL.
+                    fresh = validator is None and current is None and time.monotonic() - stored_at < self.ttl
+                if fresh:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self.entries[key]
+                self.invalidations += 1
+            self.misses += 1
+        value = load()
+        with self.lock:
+            self.entries[key] = (value, current, time.monotonic())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return value
+
+    def invalidate(self, relpath: str) -> None:
+        relpath = relpath.strip("/")
+        parent = relpath.rpartition("/")[0]
+        with self.lock:
+            for key in (("file", relpath), ("dir", parent), ("dir", relpath)):
+                if self.entries.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def stats(self) -> dict[str, int]:
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+
+def make_cached_class(base: type[obsidian.Obsidian], cache: ReadCache) -> type[obsidian.Obsidian]:
+    class CachedObsidian(base):
+        read_cache = cache
+
+        def list_files_in_vault(self) -> Any:
+            return cache.get("dir", "", super().list_files_in_vault)
+
+        def list_files_in_dir(self, dirpath: str) -> Any:
+            return cache.get("dir", dirpath, lambda: super(CachedObsidian, self).list_files_in_dir(dirpath))
+
+        def get_file_contents(self, filepath: str) -> Any:
+            return cache.get("file", filepath, lambda: super(CachedObsidian, self).get_file_contents(filepath))
+
+        def append_content(self, filepath: str, content: str) -> Any:
+            try:
+                return super().append_content(filepath, content)
+            finally:
+                cache.invalidate(filepath)
+
+        def patch_content(self, filepath: str, operation: str, target_type: str, target: str, content: str) -> Any:
+            try:
+                return super().patch_content(filepath, operation, target_type, target, content)
+            finally:
+                cache.invalidate(filepath)
+
+        def put_content(self, filepath: str, content: str) -> Any:
+            try:
+                return super().put_content(filepath, content)
+            finally:
+                cache.invalidate(filepath)
+
+        def delete_file(self, filepath: str) -> Any:
+            try:
+                return super().delete_file(filepath)
+            finally:
+                cache.invalidate(filepath)
+
+    return CachedObsidian
+
+
+def report(cache: ReadCache) -> None:
+    stats = cache.stats()
+    total = stats["hits"] + stats["misses"]
+    rate = stats["hits"] / total * 100 if total else 0.0
+    print(
+        f"[cache] hits {stats['hits']}, misses {stats['misses']} ({rate:.1f}% hit rate), "
+        f"invalidations {stats['invalidations']}, entries {stats['entries']}",
+        file=sys.stderr,
+    )
+
+
+def install(max_entries: int, vault_root: Path | None, ttl: float) -> ReadCache:
+    cache = ReadCache(max_entries, vault_root.resolve() if vault_root else None, ttl)
+    # Wraps whichever class is active, so it stacks on top of the local backend as well as REST.
+    obsidian.Obsidian = make_cached_class(obsidian.Obsidian, cache)
+    return cache
+
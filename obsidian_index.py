@@ -0,0 +1,266 @@
+"""Persistent SQLite FTS5 (trigram) index of the vault answering simple-search calls (OBSIDIAN_INDEX=1)."""
+
+from __future__ import annotations
+
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # Windows: every session refreshes the index itself.
+    fcntl = None
+
+from mcp_obsidian import obsidian
+
+from obsidian_local import SEARCH_SUFFIXES, iter_notes, search_text
+
+INDEX_NAME = ".mcp_vault_index.sqlite"
+# Trigram MATCH needs at least three characters; shorter terms (most two-character Chinese words) use instr().
+MIN_MATCH_CHARS = 3
+# Changed notes are written in transactions of this many, so the writer lock is only ever held briefly.
+WRITE_BATCH = 200
+
+
+def fts_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+class VaultIndex:
+    def __init__(self, vault_root: Path, db_path: Path, max_results: int = 0) -> None:
+        self.vault_root = vault_root.resolve()
+        self.db_path = db_path
+        # 0 returns every match, like the REST simple search.
+        self.max_results = max_results
+        # self.lock guards the writer connection, self.read_lock the reader; WAL lets them run concurrently.
+        self.lock = threading.Lock()
+        self.read_lock = threading.Lock()
+        self.ready = threading.Event()
+        self.refresher_lock: Any = None
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS notes ("
+            "id INTEGER PRIMARY KEY, path TEXT NOT NULL UNIQUE, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL)"
+        )
+        self.conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS note_fts USING fts5(body, tokenize='trigram')")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.conn.commit()
+        self.reader = sqlite3.connect(db_path, check_same_thread=False)
+
+    def index_note(self, relpath: str, stat: Any, body: str) -> None:
+        row = self.conn.execute("SELECT id FROM notes WHERE path = ?", (relpath,)).fetchone()
+        if row is None:
+            note_id = self.conn.execute(
+                "INSERT INTO notes (path, mtime_ns, size) VALUES (?, ?, ?)", (relpath, stat.st_mtime_ns, stat.st_size)
+            ).lastrowid
+        else:
+            note_id = row[0]
+            self.conn.execute(
+                "UPDATE notes SET mtime_ns = ?, size = ? WHERE id = ?", (stat.st_mtime_ns, stat.st_size, note_id)
+            )
+            self.conn.execute("DELETE FROM note_fts WHERE rowid = ?", (note_id,))
+        self.conn.execute("INSERT INTO note_fts (rowid, body) VALUES (?, ?)", (note_id, body))
+
+    def remove_note(self, relpath: str) -> None:
+        row = self.conn.execute("SELECT id FROM notes WHERE path = ?", (relpath,)).fetchone()
+        if row is not None:
+            self.conn.execute("DELETE FROM note_fts WHERE rowid = ?", (row[0],))
+            self.conn.execute("DELETE FROM notes WHERE id = ?", (row[0],))
+
+    def write_batch(self, batch: list[tuple[str, Any, str]]) -> int:
+        with self.lock, self.conn:
+            for relpath, stat, body in batch:
+                self.index_note(relpath, stat, body)
+        return len(batch)
+
+    def refresh(self) -> tuple[int, int]:
+        # Only notes whose mtime or size moved are re-read, so a steady-state pass is one stat per note.
+        # The walk, stats and reads run without any lock; searches never wait for a scan.
+        with self.read_lock:
+            rows = self.reader.execute("SELECT path, mtime_ns, size FROM notes").fetchall()
+        known = {path: (mtime_ns, size) for path, mtime_ns, size in rows}
+        changed = 0
+        batch: list[tuple[str, Any, str]] = []
+        for path in iter_notes(self.vault_root):
+            relpath = path.relative_to(self.vault_root).as_posix()
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if known.pop(relpath, None) == (stat.st_mtime_ns, stat.st_size):
+                continue
+            try:
+                batch.append((relpath, stat, path.read_bytes().decode("utf-8", errors="replace")))
+            except OSError:
+                continue
+            if len(batch) >= WRITE_BATCH:
+                changed += self.write_batch(batch)
+                batch = []
+        changed += self.write_batch(batch)
+        with self.lock, self.conn:
+            for relpath in known:
+                self.remove_note(relpath)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('refreshed_at', ?)", (str(time.time()),)
+            )
+        self.ready.set()
+        return (changed, len(known))
+
+    def claim_refresher(self) -> bool:
+        # One refresher per index file; other sessions (e.g. forked by the warm server) only read it.
+        if fcntl is None:
+            return True
+        try:
+            if self.refresher_lock is None:
+                self.refresher_lock = open(f"{self.db_path}.lock", "a")
+            fcntl.flock(self.refresher_lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return False
+        return True
+
+    def check_ready(self) -> None:
+        # A session that is not refreshing can answer once another one has completed a pass.
+        with self.read_lock:
+            row = self.reader.execute("SELECT 1 FROM meta WHERE key = 'refreshed_at'").fetchone()
+        if row is not None:
+            self.ready.set()
+
+    def refresh_path(self, relpath: str) -> None:
+        relpath = relpath.strip("/")
+        if not relpath.endswith(SEARCH_SUFFIXES):
+            return
+        path = self.vault_root / relpath
+        try:
+            note = (path.stat(), path.read_bytes().decode("utf-8", errors="replace"))
+        except OSError:
+            note = None
+        try:
+            with self.lock, self.conn:
+                if note is None:
+                    self.remove_note(relpath)
+                else:
+                    self.index_note(relpath, *note)
+        except sqlite3.Error as exc:
+            # Runs after a write that already succeeded; the next refresh pass picks the note up instead.
+            print(f"[index] could not update {relpath}: {exc}", file=sys.stderr)
+
+    def search(self, query: str, context_length: int = 100) -> list[dict[str, Any]]:
+        terms = query.lower().split()
+        if not terms:
+            return []
+        long_terms = [term for term in terms if len(term) >= MIN_MATCH_CHARS]
+        short_terms = [term for term in terms if len(term) < MIN_MATCH_CHARS]
+        clauses: list[str] = []
+        params: list[Any] = []
+        if long_terms:
+            score = "bm25(note_fts)"
+        else:
+            # No bm25() without MATCH: rank by total occurrences (negated, as ORDER BY is ascending),
+            # which is the match count the REST and local backends score by, before LIMIT cuts anything.
+            occurrences = "(length(lower(note_fts.body)) - length(replace(lower(note_fts.body), ?, ''))) / length(?)"
+            score = "-(" + " + ".join([occurrences] * len(short_terms)) + ")"
+            for term in short_terms:
+                params.extend((term, term))
+        if long_terms:
+            clauses.append("note_fts MATCH ?")
+            params.append(" AND ".join(fts_phrase(term) for term in long_terms))
+        for term in short_terms:
+            clauses.append("instr(lower(note_fts.body), ?) > 0")
+            params.append(term)
+        sql = (
+            f"SELECT notes.path, note_fts.body, {score} FROM note_fts JOIN notes ON notes.id = note_fts.rowid"
+            f" WHERE {' AND '.join(clauses)} ORDER BY 3, notes.path LIMIT ?"
+        )
+        # SQLite treats a negative LIMIT as no limit.
+        params.append(self.max_results or -1)
+        with self.read_lock:
+            rows = self.reader.execute(sql, params).fetchall()
+
+        results = []
+        for relpath, body, rank in rows:
+            matches = search_text(body, terms, context_length)
+            if matches:
+                # bm25() is lower-is-better; flip it so larger scores rank higher, like the REST API.
+                score = round(-rank, 4) if long_terms else len(matches)
+                results.append({"filename": relpath, "score": score, "matches": matches})
+        if not long_terms:
+            results.sort(key=lambda result: (-result["score"], result["filename"]))
+        return results
+
+    def close(self) -> None:
+        with self.lock, self.read_lock:
+            self.conn.close()
+            self.reader.close()
+        if self.refresher_lock is not None:
+            self.refresher_lock.close()
+
+
+def refresh_forever(index: VaultIndex, interval: float) -> None:
+    refreshing = False
+    while True:
+        try:
+            refreshing = refreshing or index.claim_refresher()
+            if not refreshing:
+                index.check_ready()
+                time.sleep(interval)
+                continue
+            changed, removed = index.refresh()
+        except sqlite3.Error as exc:
+            print(f"[index] refresh failed: {exc}", file=sys.stderr)
+        else:
+            if changed or removed:
+                print(f"[index] updated {changed}, removed {removed}", file=sys.stderr)
+        time.sleep(interval)
+
+
+def make_indexed_class(base: type[obsidian.Obsidian], index: VaultIndex) -> type[obsidian.Obsidian]:
+    class IndexedObsidian(base):
+        vault_index = index
+
+        def search(self, query: str, context_length: int = 100) -> Any:
+            # Until the first background pass has finished, the wrapped backend still answers.
+            if not index.ready.is_set():
+                return super().search(query, context_length)
+            return index.search(query, context_length)
+
+        def append_content(self, filepath: str, content: str) -> Any:
+            try:
+                return super().append_content(filepath, content)
+            finally:
+                index.refresh_path(filepath)
+
+        def patch_content(self, filepath: str, operation: str, target_type: str, target: str, content: str) -> Any:
+            try:
+                return super().patch_content(filepath, operation, target_type, target, content)
+            finally:
+                index.refresh_path(filepath)
+
+        def put_content(self, filepath: str, content: str) -> Any:
+            try:
+                return super().put_content(filepath, content)
+            finally:
+                index.refresh_path(filepath)
+
+        def delete_file(self, filepath: str) -> Any:
+            try:
+                return super().delete_file(filepath)
+            finally:
+                index.refresh_path(filepath)
+
+    return IndexedObsidian
+
+
+def install(vault_root: Path, db_path: Path | None, interval: float, max_results: int = 0) -> VaultIndex | None:
+    try:
+        index = VaultIndex(vault_root, db_path or vault_root / INDEX_NAME, max_results)
+    except sqlite3.OperationalError as exc:
+        # Builds without FTS5 or the trigram tokenizer (SQLite < 3.34) keep the normal search path.
+        print(f"[index] disabled: {exc}", file=sys.stderr)
+        return None
+    threading.Thread(target=refresh_forever, args=(index, interval), daemon=True, name="vault-index").start()
+    obsidian.Obsidian = make_indexed_class(obsidian.Obsidian, index)
+    return index
@@ -0,0 +1,138 @@
+"""Read-only mcp-obsidian calls served straight from the vault folder (OBSIDIAN_BACKEND=local)."""
+
+from __future__ import annotations
+
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import Any
+
+from mcp_obsidian import obsidian
+
+# Search maps notes of at least this size so the byte prefilter can reject them without copying them in.
+MMAP_THRESHOLD = 256 * 1024
+SEARCH_SUFFIXES = (".md", ".canvas")
+
+
+def scan_bytes(path: Path) -> bytes | mmap.mmap:
+    with open(path, "rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            return handle.read()
+        # The mapping stays valid after the file handle is closed.
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def decode(data: bytes | mmap.mmap) -> str:
+    if isinstance(data, mmap.mmap):
+        # Decoding needs a contiguous bytes copy; only notes that passed the prefilter get here.
+        with data:
+            return data[:].decode("utf-8", errors="replace")
+    return data.decode("utf-8", errors="replace")
+
+
+def not_found(relpath: str) -> Exception:
+    # Same wording as the REST client, so tool output does not depend on the backend.
+    return Exception(f"Error 40400: File not found: {relpath}")
+
+
+def resolve_in_vault(root: Path, relpath: str) -> Path:
+    path = (root / relpath.strip("/")).resolve()
+    if path != root and root not in path.parents:
+        raise not_found(relpath)
+    return path
+
+
+def list_entries(directory: Path) -> list[str]:
+    entries = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.name.startswith("."):
+                continue
+            entries.append(entry.name + "/" if entry.is_dir() else entry.name)
+    return sorted(entries)
+
+
+def iter_notes(root: Path) -> Any:
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if not name.startswith(".")]
+        for name in filenames:
+            if name.endswith(SEARCH_SUFFIXES) and not name.startswith("."):
+                yield Path(dirpath) / name
+
+
+def compile_prefilter(terms: list[str]) -> list[re.Pattern[bytes]] | None:
+    # Bytes IGNORECASE only folds ASCII; terms with other cased letters go straight to the decoded check.
+    if not all(term.isascii() or term.upper() == term.lower() for term in terms):
+        return None
+    return [re.compile(re.escape(term.encode("utf-8")), re.IGNORECASE) for term in terms]
+
+
+def search_text(text: str, terms: list[str], context_length: int) -> list[dict[str, Any]]:
+    lowered = text.lower()
+    matches = []
+    for term in terms:
+        start = lowered.find(term)
+        if start < 0:
+            return []
+        while start >= 0:
+            end = start + len(term)
+            matches.append(
+                {
+                    "match": {"start": start, "end": end},
+                    "context": text[max(0, start - context_length) : end + context_length],
+                }
+            )
+            start = lowered.find(term, end)
+    matches.sort(key=lambda match: match["match"]["start"])
+    return matches
+
+
+class LocalVaultObsidian(obsidian.Obsidian):
+    vault_root = Path(".")
+
+    def list_files_in_vault(self) -> Any:
+        return list_entries(self.vault_root)
+
+    def list_files_in_dir(self, dirpath: str) -> Any:
+        directory = resolve_in_vault(self.vault_root, dirpath)
+        if not directory.is_dir():
+            raise not_found(dirpath)
+        return list_entries(directory)
+
+    def get_file_contents(self, filepath: str) -> Any:
+        path = resolve_in_vault(self.vault_root, filepath)
+        try:
+            # The whole note is decoded anyway, so a plain read is the cheapest way in.
+            return path.read_bytes().decode("utf-8", errors="replace")
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            raise not_found(filepath) from None
+
+    def search(self, query: str, context_length: int = 100) -> Any:
+        terms = query.lower().split()
+        if not terms:
+            return []
+        prefilter = compile_prefilter(terms)
+        results = []
+        for path in iter_notes(self.vault_root):
+            try:
+                data = scan_bytes(path)
+            except OSError:
+                continue
+            if prefilter is not None and not all(pattern.search(data) for pattern in prefilter):
+                if isinstance(data, mmap.mmap):
+                    data.close()
+                continue
+            matches = search_text(decode(data), terms, context_length)
+            if matches:
+                filename = path.relative_to(self.vault_root).as_posix()
+                results.append({"filename": filename, "score": len(matches), "matches": matches})
+        results.sort(key=lambda result: (-result["score"], result["filename"]))
+        return results
+
+
+def install(vault_root: Path) -> None:
+    LocalVaultObsidian.vault_root = vault_root.resolve()
+    # tools.py looks the class up on the module for every call, so rebinding it is enough.
+    obsidian.Obsidian = LocalVaultObsidian
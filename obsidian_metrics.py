@@ -0,0 +1,189 @@
+"""Per-tool call counts, latency histograms and payload sizes for the mcp-obsidian server (OBSIDIAN_METRICS_PATH)."""
+
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, TextIO
+
+from mcp_obsidian import obsidian
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BACKEND_METHODS = (
+    "list_files_in_vault",
+    "list_files_in_dir",
+    "get_file_contents",
+    "get_batch_file_contents",
+    "search",
+    "search_json",
+    "append_content",
+    "patch_content",
+    "put_content",
+    "delete_file",
+    "get_periodic_note",
+    "get_recent_periodic_notes",
+    "get_recent_changes",
+)
+# The Prometheus textfile is rewritten at most this often; the final state is always flushed at exit.
+PROM_WRITE_INTERVAL = 1.0
+
+
+class Histogram:
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+
+class ToolMetrics:
+    def __init__(
+        self,
+        path: Path | None,
+        fmt: str = "prom",
+        slow_ms: float | None = None,
+        slow_log: TextIO = sys.stderr,
+    ) -> None:
+        self.path = path
+        self.fmt = fmt
+        self.slow_ms = slow_ms
+        self.slow_log = slow_log
+        self.lock = threading.Lock()
+        self.calls: dict[str, Histogram] = defaultdict(Histogram)
+        self.backend: dict[str, Histogram] = defaultdict(Histogram)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.request_bytes: dict[str, int] = defaultdict(int)
+        self.response_bytes: dict[str, int] = defaultdict(int)
+        self.last_write = 0.0
+        self.jsonl = open(path, "a", encoding="utf-8") if path is not None and fmt == "jsonl" else None
+
+    def observe_call(self, tool: str, arguments: Any, seconds: float, response_size: int, error: str | None) -> None:
+        request_size = len(json.dumps(arguments, ensure_ascii=False).encode("utf-8"))
+        with self.lock:
+            self.calls[tool].observe(seconds)
+            self.request_bytes[tool] += request_size
+            self.response_bytes[tool] += response_size
+            if error is not None:
+                self.errors[tool] += 1
+            if self.jsonl is not None:
+                record = {
+                    "ts": round(time.time(), 3),
+                    "tool": tool,
+                    "ms": round(seconds * 1000, 3),
+                    "request_bytes": request_size,
+                    "response_bytes": response_size,
+                    "ok": error is None,
+                }
+                self.jsonl.write(json.dumps(record, ensure_ascii=False) + "\n")
+                self.jsonl.flush()
+        if self.slow_ms is not None and seconds * 1000 >= self.slow_ms:
+            summary = json.dumps(arguments, ensure_ascii=False)[:200]
+            print(f"[slow] {tool} {seconds * 1000:.1f} ms args={summary}", file=self.slow_log, flush=True)
+        if self.fmt == "prom" and time.monotonic() - self.last_write >= PROM_WRITE_INTERVAL:
+            self.write_prom()
+
+    def observe_backend(self, method: str, seconds: float) -> None:
+        with self.lock:
+            self.backend[method].observe(seconds)
+
+    def render_prom(self) -> str:
+        lines: list[str] = []
+
+        def histogram(name: str, label: str, series: dict[str, Histogram], help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, hist in sorted(series.items()):
+                cumulative = 0
+                for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), hist.buckets):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{label}="{key}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_sum{{{label}="{key}"}} {hist.total:.6f}')
+                lines.append(f'{name}_count{{{label}="{key}"}} {hist.count}')
+
+        def counter(name: str, values: dict[str, int], help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for tool, value in sorted(values.items()):
+                lines.append(f'{name}{{tool="{tool}"}} {value}')
+
+        with self.lock:
+            histogram("obsidian_mcp_tool_seconds", "tool", self.calls, "MCP tool call latency.")
+            counter("obsidian_mcp_tool_errors_total", self.errors, "MCP tool calls that raised.")
+            counter("obsidian_mcp_tool_request_bytes_total", self.request_bytes, "JSON size of tool arguments.")
+            counter("obsidian_mcp_tool_response_bytes_total", self.response_bytes, "Size of text returned by tools.")
+            histogram("obsidian_mcp_backend_seconds", "method", self.backend, "Vault backend call latency.")
+        read_cache = getattr(obsidian.Obsidian, "read_cache", None)
+        if read_cache is not None:
+            lines.append("# TYPE obsidian_mcp_cache_events_total counter")
+            for event, value in read_cache.stats().items():
+                if event != "entries":
+                    lines.append(f'obsidian_mcp_cache_events_total{{event="{event}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def write_prom(self) -> None:
+        if self.path is None:
+            return
+        self.last_write = time.monotonic()
+        # node_exporter may read the file at any moment, so replace it atomically.
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(self.render_prom(), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def close(self) -> None:
+        if self.fmt == "prom":
+            self.write_prom()
+        if self.jsonl is not None:
+            self.jsonl.close()
+            self.jsonl = None
+        if self.slow_log is not sys.stderr and not self.slow_log.closed:
+            self.slow_log.close()
+
+
+def response_size(result: Any) -> int:
+    return sum(len(getattr(item, "text", "") or "") for item in result or ())
+
+
+def instrument_handler(name: str, run_tool: Callable[[dict], Any], metrics: ToolMetrics) -> Callable[[dict], Any]:
+    def timed_run_tool(args: dict) -> Any:
+        started = time.perf_counter()
+        try:
+            result = run_tool(args)
+        except Exception as exc:
+            metrics.observe_call(name, args, time.perf_counter() - started, 0, str(exc))
+            raise
+        metrics.observe_call(name, args, time.perf_counter() - started, response_size(result), None)
+        return result
+
+    return timed_run_tool
+
+
+def timed_method(name: str, method: Callable[..., Any], metrics: ToolMetrics) -> Callable[..., Any]:
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            metrics.observe_backend(name, time.perf_counter() - started)
+
+    return wrapper
+
+
+def install(tool_handlers: dict[str, Any], metrics: ToolMetrics) -> None:
+    for name, handler in tool_handlers.items():
+        # An instance attribute shadows ToolHandler.run_tool, which is what call_tool() invokes.
+        handler.run_tool = instrument_handler(name, handler.run_tool, metrics)
+    base = obsidian.Obsidian
+    namespace = {
+        name: timed_method(name, getattr(base, name), metrics) for name in BACKEND_METHODS if hasattr(base, name)
+    }
+    obsidian.Obsidian = type("TimedObsidian", (base,), namespace)
@@ -0,0 +1,194 @@
+"""Pre-forked warm mcp-obsidian server; new sessions attach over a Unix socket (OBSIDIAN_WARM_SOCKET).
+
+Only the standard library is imported here: the attach path must stay cheaper than the cold start it replaces.
+"""
+
+from __future__ import annotations
+
+import os
+import selectors
+import signal
+import socket
+import stat
+import struct
+import sys
+import traceback
+from typing import Callable
+
+CHUNK_SIZE = 64 * 1024
+
+
+def supported() -> bool:
+    return os.name == "posix" and hasattr(socket, "AF_UNIX") and hasattr(os, "fork")
+
+
+def write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+def relay(sock: socket.socket) -> None:
+    stdin_fd = sys.stdin.fileno()
+    stdout_fd = sys.stdout.fileno()
+    selector = selectors.DefaultSelector()
+    selector.register(stdin_fd, selectors.EVENT_READ, "stdin")
+    selector.register(sock, selectors.EVENT_READ, "socket")
+    while True:
+        for key, _ in selector.select():
+            if key.data == "stdin":
+                data = os.read(stdin_fd, CHUNK_SIZE)
+                if not data:
+                    # The client closed its end; let the session see EOF and wind down on its own.
+                    selector.unregister(stdin_fd)
+                    sock.shutdown(socket.SHUT_WR)
+                    continue
+                sock.sendall(data)
+            else:
+                data = sock.recv(CHUNK_SIZE)
+                if not data:
+                    return
+                write_all(stdout_fd, data)
+
+
+def owned_socket(path: str) -> bool:
+    # Only a socket created by this user is trusted: it receives every tool call and note body.
+    try:
+        info = os.stat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(info.st_mode) and info.st_uid == os.getuid()
+
+
+def peer_is_self(sock: socket.socket) -> bool:
+    # Linux reports the listener's credentials, which closes the gap between stat() and connect().
+    if not hasattr(socket, "SO_PEERCRED"):
+        return True
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    return struct.unpack("3i", creds)[1] == os.getuid()
+
+
+def attach(path: str) -> bool:
+    if not supported() or not os.path.exists(path):
+        return False
+    if not owned_socket(path):
+        print(f"[warm] ignoring {path}: not a socket owned by this user", file=sys.stderr)
+        return False
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        trusted = peer_is_self(sock)
+    except OSError:
+        sock.close()
+        return False
+    if not trusted:
+        sock.close()
+        print(f"[warm] ignoring {path}: the listening process belongs to another user", file=sys.stderr)
+        return False
+    with sock:
+        relay(sock)
+    return True
+
+
+def run_session(conn: socket.socket, session: Callable[[], None]) -> None:
+    # Child side of the fork: the accepted socket becomes stdin/stdout for the stdio MCP transport.
+    os.dup2(conn.fileno(), 0)
+    os.dup2(conn.fileno(), 1)
+    conn.close()
+    # The inherited sys.stdin/sys.stdout still describe the daemon's old fds (e.g. seekable log files).
+    sys.stdin = open(0, "r", encoding="utf-8", closefd=False)
+    sys.stdout = open(1, "w", encoding="utf-8", closefd=False)
+    code = 0
+    try:
+        session()
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+        except (OSError, ValueError):
+            pass
+    # os._exit, not sys.exit: unwinding would run the parent's accept-loop cleanup in the child.
+    os._exit(code)
+
+
+def stop_serving(signum: int, frame: object) -> None:
+    raise KeyboardInterrupt
+
+
+def serve(path: str, session: Callable[[], None]) -> int:
+    if not supported():
+        print("Error: the warm server needs a POSIX system (fork + Unix sockets).", file=sys.stderr)
+        return 1
+    if not path:
+        print("Error: no usable socket path; set OBSIDIAN_WARM_SOCKET.", file=sys.stderr)
+        return 1
+    if os.path.lexists(path):
+        if not owned_socket(path):
+            print(f"Error: {path} exists and is not a socket owned by this user", file=sys.stderr)
+            return 1
+        if attach_probe(path):
+            print(f"Error: a warm server is already listening on {path}", file=sys.stderr)
+            return 1
+        os.unlink(path)
+
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # bind() creates the socket file with umask permissions; never let it exist group/world-accessible.
+    old_umask = os.umask(0o177)
+    try:
+        listener.bind(path)
+    finally:
+        os.umask(old_umask)
+    os.chmod(path, 0o600)
+    listener.listen(16)
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, stop_serving)
+    print(f"[OK] warm server listening on {path}", file=sys.stderr)
+    try:
+        while True:
+            conn, _ = listener.accept()
+            if os.fork() == 0:
+                listener.close()
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                run_session(conn, session)
+            conn.close()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
+        if os.path.exists(path):
+            os.unlink(path)
+    return 0
+
+
+def attach_probe(path: str) -> bool:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        return False
+    finally:
+        sock.close()
+    return True
+
+
+def private_dir(path: str) -> str:
+    # A 0700 directory in /tmp: other users can neither pre-create the socket nor connect to it.
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise OSError(f"{path} is not a private directory owned by this user")
+    return path
+
+
+def default_socket_path() -> str:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        # XDG_RUNTIME_DIR is already per-user and 0700.
+        return os.path.join(runtime_dir, "obsidian-mcp.sock")
+    return os.path.join(private_dir(f"/tmp/obsidian-mcp-{os.getuid()}"), "warm.sock")
@@ -1,8 +1,9 @@
 import os
 import sys
-import asyncio
 from pathlib import Path
 
+TRUTHY = ("1", "true", "yes", "on")
+
 # 1. 读取当前目录下的 .env 文件（如果存在）
 env_path = Path(__file__).parent / ".env"
 env_example_path = Path(__file__).parent / ".env.example"
@@ -25,7 +26,22 @@ if "OBSIDIAN_API_KEY" not in os.environ:
     )
     sys.exit(1)
 
-# 3. 启动 mcp-obsidian (异步函数需要用 asyncio.run)
+# 3. 可选：已有预热的常驻服务（python start_obsidian.py --warm-server）时，只转发 stdio，跳过全部重型导入
+warm_server = "--warm-server" in sys.argv[1:]
+if warm_server or os.environ.get("OBSIDIAN_WARM", "").lower() in TRUTHY:
+    import obsidian_warm
+
+    try:
+        warm_socket = os.environ.get("OBSIDIAN_WARM_SOCKET") or (
+            obsidian_warm.default_socket_path() if obsidian_warm.supported() else ""
+        )
+    except OSError as exc:
+        print(f"[warm] {exc}", file=sys.stderr)
+        warm_socket = ""
+    if not warm_server and warm_socket and obsidian_warm.attach(warm_socket):
+        sys.exit(0)
+
+# 4. 加载 mcp-obsidian（导入约占冷启动的大部分时间）
 try:
     from mcp_obsidian.server import main
 except ImportError:
@@ -35,4 +51,88 @@ except ImportError:
     )
     sys.exit(1)
 
-asyncio.run(main())
+
+# 按环境变量装配可选层；返回会话结束时要执行的清理函数（warm 模式下每个 fork 出的会话各自装配一次）
+def configure_backends():
+    cleanups = []
+    # 5. 可选：本地文件后端，列目录/读文件/搜索直接读 Vault 文件夹，写操作仍走 REST
+    vault_path = Path(os.environ.get("OBSIDIAN_VAULT_PATH") or Path(__file__).parent)
+    local_backend = os.environ.get("OBSIDIAN_BACKEND", "rest").lower() == "local"
+    if local_backend:
+        if not vault_path.is_dir():
+            print(f"Error: OBSIDIAN_VAULT_PATH is not a directory: {vault_path}", file=sys.stderr)
+            sys.exit(1)
+        import obsidian_local
+
+        obsidian_local.install(vault_path)
+
+    # 6. 可选：Vault 全文索引（SQLite FTS5 trigram），后台增量刷新，简单搜索直接查索引
+    if os.environ.get("OBSIDIAN_INDEX", "").lower() in TRUTHY:
+        if not vault_path.is_dir():
+            print(f"Error: OBSIDIAN_VAULT_PATH is not a directory: {vault_path}", file=sys.stderr)
+            sys.exit(1)
+        import obsidian_index
+
+        index_path = os.environ.get("OBSIDIAN_INDEX_PATH")
+        obsidian_index.install(
+            vault_path,
+            Path(index_path) if index_path else None,
+            float(os.environ.get("OBSIDIAN_INDEX_INTERVAL", "30")),
+            int(os.environ.get("OBSIDIAN_INDEX_MAX_RESULTS", "0")),
+        )
+
+    # 7. 可选：进程内读缓存（LRU），按文件 mtime 失效，写操作会清掉对应条目
+    if os.environ.get("OBSIDIAN_CACHE", "").lower() in TRUTHY:
+        import obsidian_cache
+
+        # mtime checks need the vault on this disk; otherwise entries simply expire after OBSIDIAN_CACHE_TTL.
+        has_local_vault = local_backend or "OBSIDIAN_VAULT_PATH" in os.environ or (vault_path / ".obsidian").is_dir()
+        cache = obsidian_cache.install(
+            int(os.environ.get("OBSIDIAN_CACHE_SIZE", "256")),
+            vault_path if has_local_vault else None,
+            float(os.environ.get("OBSIDIAN_CACHE_TTL", "5")),
+        )
+        cleanups.append(lambda: obsidian_cache.report(cache))
+
+    # 8. 可选：记录每个 MCP 工具的调用次数、耗时分布和数据量（Prometheus 文本文件或 JSON-lines）
+    metrics_path = os.environ.get("OBSIDIAN_METRICS_PATH")
+    slow_call_ms = os.environ.get("OBSIDIAN_SLOW_CALL_MS")
+    if metrics_path or slow_call_ms:
+        import obsidian_metrics
+        from mcp_obsidian.server import tool_handlers
+
+        metrics_format = os.environ.get("OBSIDIAN_METRICS_FORMAT") or (
+            "prom" if metrics_path and metrics_path.endswith(".prom") else "jsonl"
+        )
+        slow_log_path = os.environ.get("OBSIDIAN_SLOW_LOG")
+        metrics = obsidian_metrics.ToolMetrics(
+            Path(metrics_path) if metrics_path else None,
+            metrics_format,
+            float(slow_call_ms) if slow_call_ms else None,
+            open(slow_log_path, "a", encoding="utf-8") if slow_log_path else sys.stderr,
+        )
+        obsidian_metrics.install(tool_handlers, metrics)
+        cleanups.append(metrics.close)
+    return cleanups
+
+
+def run_session():
+    import asyncio
+
+    cleanups = configure_backends()
+    try:
+        asyncio.run(main())
+    finally:
+        for cleanup in cleanups:
+            cleanup()
+
+
+# 9. 启动：--warm-server 预先导入后常驻，每个连接 fork 出一个会话；否则直接在当前进程服务
+if warm_server:
+    # Everything main() imports lazily is pulled in now, so forked sessions start with it loaded.
+    import asyncio
+    import mcp.server.stdio
+
+    sys.exit(obsidian_warm.serve(warm_socket, run_session))
+
+run_session()
@@ -0,0 +1,61 @@
+"""VaultIndex.search must rank before it limits, like the REST search (python -m unittest test_obsidian_index)."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+# mcp_obsidian.tools refuses to import without a key; the index never talks to the REST API.
+os.environ.setdefault("OBSIDIAN_API_KEY", "test")
+
+from obsidian_index import VaultIndex  # noqa: E402
+from obsidian_local import LocalVaultObsidian  # noqa: E402
+
+NOTES = 150
+
+
+class VaultIndexRankingTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.vault = Path(self.tmp.name) / "vault"
+        self.vault.mkdir()
+        for i in range(NOTES):
+            hits = 20 if i == NOTES - 1 else 1
+            (self.vault / f"n{i:03d}.md").write_text("数学 beamforming\n" * hits, encoding="utf-8")
+        self.indexes: list[VaultIndex] = []
+
+    def tearDown(self) -> None:
+        for index in self.indexes:
+            index.close()
+        self.tmp.cleanup()
+
+    def index(self, max_results: int = 0) -> VaultIndex:
+        index = VaultIndex(self.vault, Path(self.tmp.name) / f"index-{len(self.indexes)}.sqlite", max_results)
+        self.indexes.append(index)
+        index.refresh()
+        return index
+
+    def test_short_terms_return_every_match_ranked_by_count(self) -> None:
+        results = self.index().search("数学")
+        self.assertEqual(len(results), NOTES)
+        self.assertEqual(results[0]["filename"], f"n{NOTES - 1:03d}.md")
+        self.assertEqual(results[0]["score"], 20)
+
+    def test_short_terms_rank_before_the_limit(self) -> None:
+        results = self.index(max_results=100).search("数学")
+        self.assertEqual(len(results), 100)
+        self.assertEqual(results[0]["filename"], f"n{NOTES - 1:03d}.md")
+
+    def test_matches_the_local_backend(self) -> None:
+        LocalVaultObsidian.vault_root = self.vault.resolve()
+        expected = LocalVaultObsidian(api_key="test").search("数学")
+        self.assertEqual(self.index().search("数学"), expected)
+
+    def test_long_terms_are_not_capped_by_default(self) -> None:
+        self.assertEqual(len(self.index().search("beamforming")), NOTES)
+
+
+if __name__ == "__main__":
+    unittest.main()